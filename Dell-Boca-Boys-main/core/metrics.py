@@ -1,20 +1,547 @@
 """
 Production-grade Prometheus metrics exporters for Dell Boca Boys V2.
 Provides comprehensive observability and monitoring.
+
+Only the agent, workflow, LLM, API and cache metric families are enabled by
+default (DEFAULT_METRIC_FAMILIES). Memory, circuit breaker and collective
+intelligence metrics are no-ops unless enabled, e.g.
+init_metrics(enabled_families=DEFAULT_METRIC_FAMILIES | {'memory'}).
 """
 import time
+import asyncio
 import logging
-from typing import Optional, Dict, Any, Callable
-from functools import wraps
+import threading
+from bisect import bisect_left
+from typing import Optional, Dict, Any, Callable, Iterable, List, Tuple
+from functools import lru_cache, wraps
 from datetime import datetime
 
 from prometheus_client import (
     Counter, Gauge, Histogram, Summary, Info,
     CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST
 )
+from prometheus_client.core import (
+    CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+)
+from prometheus_client.utils import floatToGoString
 
 logger = logging.getLogger(__name__)
 
+# Label values outside these allowlists are folded into "other" so a
+# misbehaving caller cannot create an unbounded number of time series.
+# Per-entity identifiers (workflow_id, agent_id, user_id) belong in logs
+# and traces, never in metric labels.
+_OVERFLOW_LABEL = "other"
+_ALLOWED_STATUS_CODES = frozenset(
+    str(code) for code in (
+        200, 201, 202, 204, 301, 302, 304, 400, 401, 403, 404, 405, 409,
+        422, 429, 500, 502, 503, 504
+    )
+)
+
+
+def _bounded_label(value: Any, allowed: frozenset) -> str:
+    """Return value as a label, or the overflow label if not allowlisted."""
+    value = str(value)
+    return value if value in allowed else _OVERFLOW_LABEL
+
+
+# ============================================================================
+# Hot-Path Metrics
+# ============================================================================
+
+# Must be a power of two so the shard index is a mask of the label hash.
+_METRIC_SHARDS = 64
+
+
+def _label_tuple(
+    labelnames: Tuple[str, ...],
+    labelvalues: tuple,
+    labelkwargs: Dict[str, Any]
+) -> Tuple[str, ...]:
+    """Normalize positional or keyword label values to a tuple of strings."""
+    if labelkwargs:
+        if labelvalues or set(labelkwargs) != set(labelnames):
+            raise ValueError("Incorrect label names")
+        return tuple(str(labelkwargs[name]) for name in labelnames)
+    if len(labelvalues) != len(labelnames):
+        raise ValueError("Incorrect label count")
+    return tuple(str(value) for value in labelvalues)
+
+
+class _ShardedMetric:
+    """
+    Base for labelled metrics kept in lock-sharded dicts.
+
+    Each label tuple lives in the shard its hash selects, so an update
+    only takes that shard's lock and concurrent writers on different
+    label sets never contend. Shards only hold the delta since the last
+    scrape: a scrape swaps each shard's dict for an empty one (an O(1)
+    lock hold) and folds the deltas into running totals outside the
+    shard locks. Subclasses define the per-series state and how it is
+    exposed; the Prometheus family is built at scrape time.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str],
+        registry: Optional[CollectorRegistry] = None,
+        shards: int = _METRIC_SHARDS
+    ):
+        """
+        Initialize sharded metric.
+
+        Args:
+            name: Metric name
+            documentation: Metric help text
+            labelnames: Label names
+            registry: Registry to register with (skipped if None)
+            shards: Number of lock shards (power of two)
+        """
+        if shards & (shards - 1):
+            raise ValueError("shards must be a power of two")
+
+        self._name = name
+        self._documentation = documentation
+        self._labelnames = tuple(labelnames)
+        self._mask = shards - 1
+        # [pending series dict, lock]; the dict is replaced on every scrape
+        self._shards = [[{}, threading.Lock()] for _ in range(shards)]
+        self._totals: Dict[Tuple[str, ...], Any] = {}
+        self._collect_lock = threading.Lock()
+
+        if registry is not None:
+            registry.register(self)
+
+    def _update(self, labelvalues: Tuple[str, ...], amount: float) -> None:
+        shard = self._shards[hash(labelvalues) & self._mask]
+        with shard[1]:
+            self._apply(shard[0], labelvalues, amount)
+
+    def _update_many(self, entries: List[Tuple[Tuple[str, ...], float]]) -> None:
+        """Apply a batch of updates, taking each touched shard's lock once."""
+        by_shard: Dict[int, list] = {}
+        for entry in entries:
+            by_shard.setdefault(hash(entry[0]) & self._mask, []).append(entry)
+
+        for index, shard_entries in by_shard.items():
+            shard = self._shards[index]
+            with shard[1]:
+                series = shard[0]
+                for labelvalues, amount in shard_entries:
+                    self._apply(series, labelvalues, amount)
+
+    def _apply(self, series: Dict[Tuple[str, ...], Any], labelvalues: Tuple[str, ...], amount: float) -> None:
+        """Record one update into a shard's pending series (lock held)."""
+        raise NotImplementedError
+
+    def _drain(self) -> None:
+        """Swap out every shard's pending deltas and fold them into the totals."""
+        for shard in self._shards:
+            with shard[1]:
+                pending, shard[0] = shard[0], {}
+            for labelvalues, delta in pending.items():
+                self._merge(labelvalues, delta)
+
+    def values(self) -> Dict[Tuple[str, ...], Any]:
+        """Snapshot all label tuples and their cumulative state."""
+        with self._collect_lock:
+            self._drain()
+            return self._snapshot()
+
+    def _merge(self, labelvalues: Tuple[str, ...], delta: Any) -> None:
+        raise NotImplementedError
+
+    def _snapshot(self) -> Dict[Tuple[str, ...], Any]:
+        return dict(self._totals)
+
+    def _family(self):
+        raise NotImplementedError
+
+    def _add_sample(self, family, labelvalues: Tuple[str, ...], value: Any) -> None:
+        raise NotImplementedError
+
+    def describe(self):
+        return [self._family()]
+
+    def collect(self):
+        family = self._family()
+        for labelvalues, value in self.values().items():
+            self._add_sample(family, labelvalues, value)
+        yield family
+
+
+class _FastCounterChild:
+    """Counter bound to a fixed label tuple (mirrors Counter.labels())."""
+
+    __slots__ = ("_metric", "_labelvalues")
+
+    def __init__(self, counter: "FastCounter", labelvalues: Tuple[str, ...]):
+        self._metric = counter
+        self._labelvalues = labelvalues
+
+    def inc(self, amount: float = 1) -> None:
+        """Increment the counter by amount."""
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts.")
+        self._metric._update(self._labelvalues, amount)
+
+
+class FastCounter(_ShardedMetric):
+    """
+    Labelled counter for per-request hot paths.
+
+    Drop-in for prometheus_client.Counter's labels(...).inc() API; the
+    ``_total`` suffix is added on exposition.
+    """
+
+    def labels(self, *labelvalues: Any, **labelkwargs: Any) -> _FastCounterChild:
+        """Return the child counter for the given label values."""
+        return _FastCounterChild(self, _label_tuple(self._labelnames, labelvalues, labelkwargs))
+
+    def _apply(self, series: Dict[Tuple[str, ...], Any], labelvalues: Tuple[str, ...], amount: float) -> None:
+        series[labelvalues] = series.get(labelvalues, 0) + amount
+
+    def _merge(self, labelvalues: Tuple[str, ...], delta: float) -> None:
+        self._totals[labelvalues] = self._totals.get(labelvalues, 0) + delta
+
+    def _family(self):
+        return CounterMetricFamily(self._name, self._documentation, labels=self._labelnames)
+
+    def _add_sample(self, family, labelvalues: Tuple[str, ...], value: float) -> None:
+        family.add_metric(labelvalues, value)
+
+
+class _FastHistogramChild:
+    """Histogram bound to a fixed label tuple (mirrors Histogram.labels())."""
+
+    __slots__ = ("_metric", "_labelvalues")
+
+    def __init__(self, histogram: "FastHistogram", labelvalues: Tuple[str, ...]):
+        self._metric = histogram
+        self._labelvalues = labelvalues
+
+    def observe(self, amount: float) -> None:
+        """Observe a value."""
+        self._metric._update(self._labelvalues, amount)
+
+
+class FastHistogram(_ShardedMetric):
+    """
+    Labelled histogram for per-request hot paths.
+
+    Each series is a flat list of per-bucket counts followed by the sum.
+    observe() bisects the bucket bounds (C-level, O(log n)) and bumps
+    two list slots under the shard lock; cumulative ``le`` buckets are
+    only computed at scrape time.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str],
+        registry: Optional[CollectorRegistry] = None,
+        buckets: Iterable[float] = Histogram.DEFAULT_BUCKETS,
+        shards: int = _METRIC_SHARDS
+    ):
+        """
+        Initialize fast histogram.
+
+        Args:
+            name: Metric name
+            documentation: Metric help text
+            labelnames: Label names
+            registry: Registry to register with (skipped if None)
+            buckets: Bucket upper bounds (+Inf is appended if missing)
+            shards: Number of lock shards (power of two)
+        """
+        upper_bounds = sorted(float(bound) for bound in buckets)
+        if not upper_bounds or upper_bounds[-1] != float("inf"):
+            upper_bounds.append(float("inf"))
+        self._upper_bounds = tuple(upper_bounds)
+        self._le = tuple(floatToGoString(bound) for bound in self._upper_bounds)
+
+        super().__init__(name, documentation, labelnames, registry=registry, shards=shards)
+
+    def labels(self, *labelvalues: Any, **labelkwargs: Any) -> _FastHistogramChild:
+        """Return the child histogram for the given label values."""
+        return _FastHistogramChild(self, _label_tuple(self._labelnames, labelvalues, labelkwargs))
+
+    def observe(self, amount: float) -> None:
+        """Observe a value on an unlabelled histogram."""
+        if self._labelnames:
+            raise ValueError("Labelled histogram; use labels(...).observe()")
+        self._update((), amount)
+
+    def _apply(self, series: Dict[Tuple[str, ...], Any], labelvalues: Tuple[str, ...], amount: float) -> None:
+        state = series.get(labelvalues)
+        if state is None:
+            state = series[labelvalues] = [0] * len(self._upper_bounds) + [0.0]
+        state[bisect_left(self._upper_bounds, amount)] += 1
+        state[-1] += amount
+
+    def _merge(self, labelvalues: Tuple[str, ...], delta: list) -> None:
+        total = self._totals.get(labelvalues)
+        if total is None:
+            # Drained lists are no longer reachable by writers; adopt them.
+            self._totals[labelvalues] = delta
+        else:
+            for index, value in enumerate(delta):
+                total[index] += value
+
+    def _snapshot(self) -> Dict[Tuple[str, ...], Any]:
+        return {labelvalues: list(state) for labelvalues, state in self._totals.items()}
+
+    def _family(self):
+        return HistogramMetricFamily(self._name, self._documentation, labels=self._labelnames)
+
+    def _add_sample(self, family, labelvalues: Tuple[str, ...], state: list) -> None:
+        cumulative = 0
+        buckets = []
+        for le, count in zip(self._le, state):
+            cumulative += count
+            buckets.append((le, cumulative))
+        family.add_metric(labelvalues, buckets, state[-1])
+
+
+class _SnapshotGaugeChild:
+    """Snapshot gauge bound to a fixed label tuple (mirrors Gauge.labels())."""
+
+    __slots__ = ("_gauge", "_labelvalues")
+
+    def __init__(self, gauge: "SnapshotGauge", labelvalues: Tuple[str, ...]):
+        self._gauge = gauge
+        self._labelvalues = labelvalues
+
+    def set(self, value: float) -> None:
+        """Set gauge to the given value."""
+        self._gauge._values[self._labelvalues] = float(value)
+
+
+class SnapshotGauge:
+    """
+    Rarely-updated gauge read at scrape time without locks.
+
+    Values are plain floats in a dict; set() is a single dict store,
+    which is atomic in CPython. Not registered on its own: the owning
+    MetricsCollector yields it from its collect().
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        """
+        Initialize snapshot gauge.
+
+        Args:
+            name: Metric name
+            documentation: Metric help text
+            labelnames: Label names
+        """
+        self._name = name
+        self._documentation = documentation
+        self._labelnames = tuple(labelnames)
+        # Unlabelled gauges expose 0 until first set, like Gauge
+        self._values: Dict[Tuple[str, ...], float] = {} if self._labelnames else {(): 0.0}
+
+    def labels(self, *labelvalues: Any, **labelkwargs: Any) -> _SnapshotGaugeChild:
+        """Return the child gauge for the given label values."""
+        return _SnapshotGaugeChild(self, _label_tuple(self._labelnames, labelvalues, labelkwargs))
+
+    def set(self, value: float) -> None:
+        """Set an unlabelled gauge to the given value."""
+        if self._labelnames:
+            raise ValueError("Labelled gauge; use labels(...).set()")
+        self._values[()] = float(value)
+
+    def describe(self):
+        return [GaugeMetricFamily(self._name, self._documentation, labels=self._labelnames)]
+
+    def collect(self):
+        family = GaugeMetricFamily(self._name, self._documentation, labels=self._labelnames)
+        for labelvalues, value in self._values.copy().items():
+            family.add_metric(labelvalues, value)
+        yield family
+
+
+# ============================================================================
+# Update Batching
+# ============================================================================
+
+class _PendingUpdates:
+    """One thread's buffer of not-yet-applied hot-path metric updates."""
+
+    __slots__ = ("entries", "lock", "owner", "flush_loop")
+
+    def __init__(self):
+        self.entries: list = []
+        # Only contended when a scrape flushes this thread's buffer
+        self.lock = threading.Lock()
+        self.owner = threading.current_thread()
+        # Loop a delayed flush is scheduled on; a loop that closed before
+        # firing it no longer matches, so the next loop reschedules
+        self.flush_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+class _MetricBatcher:
+    """
+    Buffers decorator updates per thread and applies them in batches.
+
+    When many tracked calls complete together, their observations are
+    grouped so each sharded metric takes each shard lock once per batch
+    instead of once per update. A buffer is flushed when it reaches
+    max_pending entries, flush_delay seconds after its first entry (via
+    the running event loop), or before every scrape. Outside an event
+    loop there is no timer, so updates are applied immediately.
+    """
+
+    def __init__(self, max_pending: int = 32, flush_delay: float = 0.01):
+        self.max_pending = max_pending
+        self.flush_delay = flush_delay
+        self._local = threading.local()
+        self._buffers: List[_PendingUpdates] = []
+        self._buffers_lock = threading.Lock()
+
+    def _buffer(self) -> _PendingUpdates:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = _PendingUpdates()
+            with self._buffers_lock:
+                self._buffers.append(buffer)
+        return buffer
+
+    def add(self, child: Any, amount: float = 1) -> None:
+        """Queue an inc()/observe() of amount on a FastCounter/FastHistogram child."""
+        buffer = self._buffer()
+        with buffer.lock:
+            buffer.entries.append((child._metric, child._labelvalues, amount))
+            full = len(buffer.entries) >= self.max_pending
+
+        if full:
+            self._flush(buffer)
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._flush(buffer)
+            return
+
+        if buffer.flush_loop is not loop:
+            buffer.flush_loop = loop
+            loop.call_later(self.flush_delay, self._flush, buffer)
+
+    def _flush(self, buffer: _PendingUpdates) -> None:
+        with buffer.lock:
+            entries, buffer.entries = buffer.entries, []
+            buffer.flush_loop = None
+
+        if not entries:
+            return
+
+        by_metric: Dict[_ShardedMetric, list] = {}
+        for metric, labelvalues, amount in entries:
+            by_metric.setdefault(metric, []).append((labelvalues, amount))
+        for metric, metric_entries in by_metric.items():
+            metric._update_many(metric_entries)
+
+    def flush_all(self) -> None:
+        """Apply every thread's pending updates (called before a scrape)."""
+        with self._buffers_lock:
+            buffers = list(self._buffers)
+
+        for buffer in buffers:
+            self._flush(buffer)
+
+        # Buffers of finished threads are empty now and never refilled
+        with self._buffers_lock:
+            self._buffers = [buffer for buffer in self._buffers if buffer.owner.is_alive()]
+
+
+_batcher = _MetricBatcher()
+
+
+# ============================================================================
+# Metric Families
+# ============================================================================
+
+# Optional metric families and the MetricsCollector attributes each one
+# owns. System metrics are always enabled.
+METRIC_FAMILIES: Dict[str, Tuple[str, ...]] = {
+    'agent': (
+        'agent_total', 'agent_active', 'agent_health',
+        'agent_task_duration', 'agent_task_total'
+    ),
+    'workflow': (
+        'workflow_total', 'workflow_status', 'workflow_execution_duration',
+        'workflow_execution_total', 'workflow_best_practices_score'
+    ),
+    'llm': (
+        'llm_request_total', 'llm_request_duration', 'llm_tokens_used',
+        'llm_cost_estimate'
+    ),
+    'memory': (
+        'memory_operation_total', 'memory_operation_duration',
+        'memory_size_bytes', 'memory_entries_total'
+    ),
+    'cache': ('cache_hits_total', 'cache_misses_total', 'cache_size_bytes'),
+    'api': (
+        'api_request_total', 'api_request_duration', 'api_active_requests',
+        'rate_limit_exceeded_total'
+    ),
+    'circuit_breaker': (
+        'circuit_breaker_state', 'circuit_breaker_success_total',
+        'circuit_breaker_failure_total', 'circuit_breaker_rejected_total'
+    ),
+    'ci': (
+        'ci_emergent_behaviors', 'ci_network_size', 'ci_emergence_potential',
+        'ci_collaboration_events'
+    ),
+}
+
+DEFAULT_METRIC_FAMILIES = frozenset({'agent', 'workflow', 'llm', 'api', 'cache'})
+
+
+class _NullMetric:
+    """
+    No-op stand-in for a metric whose family is disabled.
+
+    Accepts every metric and child call so instrumented code keeps
+    working. It also poses as its own sharded-metric child (_metric,
+    _labelvalues, _update_many) so batched decorator updates are dropped.
+    """
+
+    _labelvalues = ()
+
+    @property
+    def _metric(self) -> "_NullMetric":
+        return self
+
+    def labels(self, *labelvalues: Any, **labelkwargs: Any) -> "_NullMetric":
+        return self
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def dec(self, amount: float = 1) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+    def observe(self, amount: float) -> None:
+        pass
+
+    def _update_many(self, entries: list) -> None:
+        pass
+
+    def values(self) -> Dict[Tuple[str, ...], Any]:
+        return {}
+
+
+_NULL_METRIC = _NullMetric()
+
 
 # ============================================================================
 # Metrics Registry
@@ -33,289 +560,314 @@ class MetricsCollector:
     - API requests and errors
     """
 
-    def __init__(self, registry: Optional[CollectorRegistry] = None):
+    def __init__(
+        self,
+        registry: Optional[CollectorRegistry] = None,
+        exposition_ttl: float = 1.0,
+        uptime_interval: float = 5.0,
+        enabled_families: Optional[Iterable[str]] = None
+    ):
         """
         Initialize metrics collector.
 
         Args:
             registry: Prometheus registry (creates new if None)
+            exposition_ttl: Seconds to reuse the last exposition (0 disables)
+            uptime_interval: Seconds between background uptime updates
+            enabled_families: Metric families to create (see METRIC_FAMILIES);
+                defaults to DEFAULT_METRIC_FAMILIES. Metrics of disabled
+                families are no-ops and are never registered.
         """
         self.registry = registry or CollectorRegistry()
 
-        # ====================================================================
-        # Agent Metrics
-        # ====================================================================
-
-        self.agent_total = Counter(
-            'dell_boca_agent_total',
-            'Total number of agents created',
-            ['agent_type'],
-            registry=self.registry
-        )
-
-        self.agent_active = Gauge(
-            'dell_boca_agent_active',
-            'Number of currently active agents',
-            ['agent_type'],
-            registry=self.registry
+        self.enabled_families = frozenset(
+            DEFAULT_METRIC_FAMILIES if enabled_families is None else enabled_families
         )
+        unknown = self.enabled_families - METRIC_FAMILIES.keys()
+        if unknown:
+            raise ValueError(f"Unknown metric families: {sorted(unknown)}")
 
-        self.agent_health = Gauge(
-            'dell_boca_agent_health',
-            'Agent health status (1=healthy, 0=unhealthy)',
-            ['agent_id', 'agent_type'],
-            registry=self.registry
-        )
+        # Scrapes within exposition_ttl of each other share one rendering
+        self.exposition_ttl = exposition_ttl
+        self._exposition_cache = b''
+        self._exposition_ts = float('-inf')
+        self._exposition_lock = threading.Lock()
 
-        self.agent_task_duration = Histogram(
-            'dell_boca_agent_task_duration_seconds',
-            'Agent task execution duration',
-            ['agent_type', 'task_type'],
-            registry=self.registry,
-            buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0]
-        )
+        # ====================================================================
+        # Agent Metrics
+        # ====================================================================
 
-        self.agent_task_total = Counter(
-            'dell_boca_agent_task_total',
-            'Total agent tasks executed',
-            ['agent_type', 'task_type', 'status'],
-            registry=self.registry
-        )
+        if 'agent' in self.enabled_families:
+            self.agent_total = Counter(
+                'dell_boca_agent_total',
+                'Total number of agents created',
+                ['agent_type'],
+                registry=self.registry
+            )
+
+            self.agent_active = Gauge(
+                'dell_boca_agent_active',
+                'Number of currently active agents',
+                ['agent_type'],
+                registry=self.registry
+            )
+
+            self.agent_health = Gauge(
+                'dell_boca_agent_health',
+                'Agent health status (1=healthy, 0=unhealthy)',
+                ['agent_type'],
+                registry=self.registry
+            )
+
+            self.agent_task_duration = FastHistogram(
+                'dell_boca_agent_task_duration_seconds',
+                'Agent task execution duration',
+                ['agent_type', 'task_type'],
+                registry=self.registry,
+                buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0]
+            )
+
+            self.agent_task_total = FastCounter(
+                'dell_boca_agent_task_total',
+                'Total agent tasks executed',
+                ['agent_type', 'task_type', 'status'],
+                registry=self.registry
+            )
 
         # ====================================================================
         # Workflow Metrics
         # ====================================================================
 
-        self.workflow_total = Counter(
-            'dell_boca_workflow_total',
-            'Total workflows created',
-            ['created_by'],
-            registry=self.registry
-        )
-
-        self.workflow_status = Gauge(
-            'dell_boca_workflow_status',
-            'Workflows by status',
-            ['status'],
-            registry=self.registry
-        )
-
-        self.workflow_execution_duration = Histogram(
-            'dell_boca_workflow_execution_duration_seconds',
-            'Workflow execution duration',
-            ['workflow_id', 'mode'],
-            registry=self.registry,
-            buckets=[1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0]
-        )
-
-        self.workflow_execution_total = Counter(
-            'dell_boca_workflow_execution_total',
-            'Total workflow executions',
-            ['workflow_id', 'mode', 'status'],
-            registry=self.registry
-        )
-
-        self.workflow_best_practices_score = Gauge(
-            'dell_boca_workflow_best_practices_score',
-            'Workflow best practices score',
-            ['workflow_id'],
-            registry=self.registry
-        )
+        if 'workflow' in self.enabled_families:
+            self.workflow_total = Counter(
+                'dell_boca_workflow_total',
+                'Total workflows created',
+                ['created_by'],
+                registry=self.registry
+            )
+
+            self.workflow_status = SnapshotGauge(
+                'dell_boca_workflow_status',
+                'Workflows by status',
+                ['status']
+            )
+
+            # Unlabelled: every label multiplies a histogram by its bucket
+            # count; the per-mode breakdown lives on workflow_execution_total
+            self.workflow_execution_duration = FastHistogram(
+                'dell_boca_workflow_execution_duration_seconds',
+                'Workflow execution duration',
+                [],
+                registry=self.registry,
+                buckets=[1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0]
+            )
+
+            self.workflow_execution_total = FastCounter(
+                'dell_boca_workflow_execution_total',
+                'Total workflow executions',
+                ['mode', 'status'],
+                registry=self.registry
+            )
+
+            self.workflow_best_practices_score = Gauge(
+                'dell_boca_workflow_best_practices_score',
+                'Best practices score of the most recently validated workflow',
+                [],
+                registry=self.registry
+            )
 
         # ====================================================================
         # LLM Metrics
         # ====================================================================
 
-        self.llm_request_total = Counter(
-            'dell_boca_llm_request_total',
-            'Total LLM requests',
-            ['provider', 'model', 'status'],
-            registry=self.registry
-        )
-
-        self.llm_request_duration = Histogram(
-            'dell_boca_llm_request_duration_seconds',
-            'LLM request duration',
-            ['provider', 'model'],
-            registry=self.registry,
-            buckets=[0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0]
-        )
-
-        self.llm_tokens_used = Counter(
-            'dell_boca_llm_tokens_used_total',
-            'Total LLM tokens used',
-            ['provider', 'model', 'type'],  # type: prompt, completion
-            registry=self.registry
-        )
-
-        self.llm_cost_estimate = Counter(
-            'dell_boca_llm_cost_estimate_usd',
-            'Estimated LLM cost in USD',
-            ['provider', 'model'],
-            registry=self.registry
-        )
+        if 'llm' in self.enabled_families:
+            self.llm_request_total = FastCounter(
+                'dell_boca_llm_request_total',
+                'Total LLM requests',
+                ['provider', 'model', 'status'],
+                registry=self.registry
+            )
+
+            self.llm_request_duration = FastHistogram(
+                'dell_boca_llm_request_duration_seconds',
+                'LLM request duration',
+                ['provider', 'model'],
+                registry=self.registry,
+                buckets=[0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0]
+            )
+
+            self.llm_tokens_used = FastCounter(
+                'dell_boca_llm_tokens_used_total',
+                'Total LLM tokens used',
+                ['provider', 'model', 'type'],  # type: prompt, completion
+                registry=self.registry
+            )
+
+            self.llm_cost_estimate = FastCounter(
+                'dell_boca_llm_cost_estimate_usd',
+                'Estimated LLM cost in USD',
+                ['provider', 'model'],
+                registry=self.registry
+            )
 
         # ====================================================================
         # Memory Metrics
         # ====================================================================
 
-        self.memory_operation_total = Counter(
-            'dell_boca_memory_operation_total',
-            'Total memory operations',
-            ['operation', 'provider', 'memory_type', 'status'],
-            registry=self.registry
-        )
-
-        self.memory_operation_duration = Histogram(
-            'dell_boca_memory_operation_duration_seconds',
-            'Memory operation duration',
-            ['operation', 'provider'],
-            registry=self.registry,
-            buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0]
-        )
-
-        self.memory_size_bytes = Gauge(
-            'dell_boca_memory_size_bytes',
-            'Total memory size in bytes',
-            ['provider', 'memory_type'],
-            registry=self.registry
-        )
-
-        self.memory_entries_total = Gauge(
-            'dell_boca_memory_entries_total',
-            'Total memory entries',
-            ['provider', 'memory_type'],
-            registry=self.registry
-        )
+        if 'memory' in self.enabled_families:
+            self.memory_operation_total = FastCounter(
+                'dell_boca_memory_operation_total',
+                'Total memory operations',
+                ['operation', 'provider', 'memory_type', 'status'],
+                registry=self.registry
+            )
+
+            self.memory_operation_duration = FastHistogram(
+                'dell_boca_memory_operation_duration_seconds',
+                'Memory operation duration',
+                ['operation', 'provider'],
+                registry=self.registry,
+                buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0]
+            )
+
+            self.memory_size_bytes = Gauge(
+                'dell_boca_memory_size_bytes',
+                'Total memory size in bytes',
+                ['provider', 'memory_type'],
+                registry=self.registry
+            )
+
+            self.memory_entries_total = Gauge(
+                'dell_boca_memory_entries_total',
+                'Total memory entries',
+                ['provider', 'memory_type'],
+                registry=self.registry
+            )
 
         # ====================================================================
         # Cache Metrics
         # ====================================================================
 
-        self.cache_hits_total = Counter(
-            'dell_boca_cache_hits_total',
-            'Total cache hits',
-            ['namespace'],
-            registry=self.registry
-        )
-
-        self.cache_misses_total = Counter(
-            'dell_boca_cache_misses_total',
-            'Total cache misses',
-            ['namespace'],
-            registry=self.registry
-        )
-
-        self.cache_hit_rate = Gauge(
-            'dell_boca_cache_hit_rate',
-            'Cache hit rate (0-1)',
-            ['namespace'],
-            registry=self.registry
-        )
-
-        self.cache_size_bytes = Gauge(
-            'dell_boca_cache_size_bytes',
-            'Cache size in bytes',
-            [],
-            registry=self.registry
-        )
+        if 'cache' in self.enabled_families:
+            self.cache_hits_total = FastCounter(
+                'dell_boca_cache_hits_total',
+                'Total cache hits',
+                ['namespace'],
+                registry=self.registry
+            )
+
+            self.cache_misses_total = FastCounter(
+                'dell_boca_cache_misses_total',
+                'Total cache misses',
+                ['namespace'],
+                registry=self.registry
+            )
+
+            # dell_boca_cache_hit_rate is derived from hits/misses at scrape
+            # time in collect() rather than recomputed on every cache access.
+
+            self.cache_size_bytes = SnapshotGauge(
+                'dell_boca_cache_size_bytes',
+                'Cache size in bytes'
+            )
 
         # ====================================================================
         # API Metrics
         # ====================================================================
 
-        self.api_request_total = Counter(
-            'dell_boca_api_request_total',
-            'Total API requests',
-            ['method', 'endpoint', 'status_code'],
-            registry=self.registry
-        )
-
-        self.api_request_duration = Histogram(
-            'dell_boca_api_request_duration_seconds',
-            'API request duration',
-            ['method', 'endpoint'],
-            registry=self.registry,
-            buckets=[0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0]
-        )
-
-        self.api_active_requests = Gauge(
-            'dell_boca_api_active_requests',
-            'Number of active API requests',
-            ['endpoint'],
-            registry=self.registry
-        )
-
-        self.rate_limit_exceeded_total = Counter(
-            'dell_boca_rate_limit_exceeded_total',
-            'Total rate limit violations',
-            ['endpoint', 'user_id'],
-            registry=self.registry
-        )
+        if 'api' in self.enabled_families:
+            self.api_request_total = FastCounter(
+                'dell_boca_api_request_total',
+                'Total API requests',
+                ['method', 'endpoint', 'status_code'],
+                registry=self.registry
+            )
+
+            self.api_request_duration = FastHistogram(
+                'dell_boca_api_request_duration_seconds',
+                'API request duration',
+                ['method', 'endpoint'],
+                registry=self.registry,
+                buckets=[0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0]
+            )
+
+            self.api_active_requests = Gauge(
+                'dell_boca_api_active_requests',
+                'Number of active API requests',
+                ['endpoint'],
+                registry=self.registry
+            )
+
+            self.rate_limit_exceeded_total = Counter(
+                'dell_boca_rate_limit_exceeded_total',
+                'Total rate limit violations',
+                ['endpoint'],
+                registry=self.registry
+            )
 
         # ====================================================================
         # Circuit Breaker Metrics
         # ====================================================================
 
-        self.circuit_breaker_state = Gauge(
-            'dell_boca_circuit_breaker_state',
-            'Circuit breaker state (0=closed, 1=half-open, 2=open)',
-            ['name'],
-            registry=self.registry
-        )
-
-        self.circuit_breaker_success_total = Counter(
-            'dell_boca_circuit_breaker_success_total',
-            'Circuit breaker successful calls',
-            ['name'],
-            registry=self.registry
-        )
-
-        self.circuit_breaker_failure_total = Counter(
-            'dell_boca_circuit_breaker_failure_total',
-            'Circuit breaker failed calls',
-            ['name'],
-            registry=self.registry
-        )
-
-        self.circuit_breaker_rejected_total = Counter(
-            'dell_boca_circuit_breaker_rejected_total',
-            'Circuit breaker rejected calls',
-            ['name'],
-            registry=self.registry
-        )
+        if 'circuit_breaker' in self.enabled_families:
+            self.circuit_breaker_state = Gauge(
+                'dell_boca_circuit_breaker_state',
+                'Circuit breaker state (0=closed, 1=half-open, 2=open)',
+                ['name'],
+                registry=self.registry
+            )
+
+            self.circuit_breaker_success_total = Counter(
+                'dell_boca_circuit_breaker_success_total',
+                'Circuit breaker successful calls',
+                ['name'],
+                registry=self.registry
+            )
+
+            self.circuit_breaker_failure_total = Counter(
+                'dell_boca_circuit_breaker_failure_total',
+                'Circuit breaker failed calls',
+                ['name'],
+                registry=self.registry
+            )
+
+            self.circuit_breaker_rejected_total = Counter(
+                'dell_boca_circuit_breaker_rejected_total',
+                'Circuit breaker rejected calls',
+                ['name'],
+                registry=self.registry
+            )
 
         # ====================================================================
         # Collective Intelligence Metrics
         # ====================================================================
 
-        self.ci_emergent_behaviors = Gauge(
-            'dell_boca_ci_emergent_behaviors_total',
-            'Total emergent behaviors detected',
-            [],
-            registry=self.registry
-        )
-
-        self.ci_network_size = Gauge(
-            'dell_boca_ci_network_size',
-            'Size of agent network',
-            [],
-            registry=self.registry
-        )
-
-        self.ci_emergence_potential = Gauge(
-            'dell_boca_ci_emergence_potential',
-            'Collective intelligence emergence potential',
-            [],
-            registry=self.registry
-        )
-
-        self.ci_collaboration_events = Counter(
-            'dell_boca_ci_collaboration_events_total',
-            'Collective intelligence collaboration events',
-            ['type'],
-            registry=self.registry
-        )
+        if 'ci' in self.enabled_families:
+            self.ci_emergent_behaviors = SnapshotGauge(
+                'dell_boca_ci_emergent_behaviors_total',
+                'Total emergent behaviors detected'
+            )
+
+            self.ci_network_size = SnapshotGauge(
+                'dell_boca_ci_network_size',
+                'Size of agent network'
+            )
+
+            self.ci_emergence_potential = SnapshotGauge(
+                'dell_boca_ci_emergence_potential',
+                'Collective intelligence emergence potential'
+            )
+
+            self.ci_collaboration_events = Counter(
+                'dell_boca_ci_collaboration_events_total',
+                'Collective intelligence collaboration events',
+                ['type'],
+                registry=self.registry
+            )
+
+        for family in METRIC_FAMILIES.keys() - self.enabled_families:
+            for attribute in METRIC_FAMILIES[family]:
+                setattr(self, attribute, _NULL_METRIC)
 
         # ====================================================================
         # System Metrics
@@ -334,28 +886,125 @@ class MetricsCollector:
         )
 
         # Initialize system info
-        self._start_time = time.time()
+        self._start_time = time.monotonic()
         self.system_info.info({
             'version': '2.0.0',
             'environment': 'production'
         })
 
+        # Uptime advances on its own timer instead of on every scrape. The
+        # thread is started by init_metrics() or the first export, so merely
+        # importing this module never starts one
+        self._uptime_interval = uptime_interval
+        self._stop_event = threading.Event()
+        self._uptime_lock = threading.Lock()
+        self._uptime_thread: Optional[threading.Thread] = None
+
+        # Hot-path counters and histograms (agent/workflow/LLM/memory/
+        # cache/API) are sharded by label hash; low-rate metrics stay on
+        # prometheus_client.
+
+        # Rarely-updated, read-mostly gauges are lock-free snapshots that
+        # this collector yields itself, alongside scrape-time derived
+        # metrics (see collect())
+        self._snapshot_gauges = tuple(
+            gauge for gauge in (
+                self.workflow_status,
+                self.cache_size_bytes,
+                self.ci_emergent_behaviors,
+                self.ci_network_size,
+                self.ci_emergence_potential
+            )
+            if isinstance(gauge, SnapshotGauge)
+        )
+        self.registry.register(self)
+
         logger.info("Metrics collector initialized")
 
+    def describe(self):
+        families = [
+            family for gauge in self._snapshot_gauges for family in gauge.describe()
+        ]
+        if 'cache' in self.enabled_families:
+            families.append(
+                GaugeMetricFamily('dell_boca_cache_hit_rate', 'Cache hit rate (0-1)', labels=['namespace'])
+            )
+        return families
+
+    def collect(self):
+        """Yield snapshot gauges and metrics derived at scrape time."""
+        for gauge in self._snapshot_gauges:
+            yield from gauge.collect()
+
+        if 'cache' not in self.enabled_families:
+            return
+
+        hits = self.cache_hits_total.values()
+        misses = self.cache_misses_total.values()
+
+        hit_rate = GaugeMetricFamily(
+            'dell_boca_cache_hit_rate',
+            'Cache hit rate (0-1)',
+            labels=['namespace']
+        )
+        for labelvalues in hits.keys() | misses.keys():
+            hit_count = hits.get(labelvalues, 0)
+            total = hit_count + misses.get(labelvalues, 0)
+            hit_rate.add_metric(labelvalues, hit_count / total if total else 0.0)
+        yield hit_rate
+
     def update_system_uptime(self):
         """Update system uptime metric."""
-        uptime = time.time() - self._start_time
+        uptime = time.monotonic() - self._start_time
         self.system_uptime_seconds.set(uptime)
 
+    def start_uptime_updates(self):
+        """Start the background uptime updates if not already running."""
+        with self._uptime_lock:
+            if self._uptime_thread is not None or self._stop_event.is_set():
+                return
+            self.update_system_uptime()
+            self._uptime_thread = threading.Thread(
+                target=self._run_uptime_updates,
+                name="metrics-uptime",
+                daemon=True
+            )
+            self._uptime_thread.start()
+
+    def _run_uptime_updates(self):
+        """Background loop refreshing the uptime gauge until close()."""
+        while not self._stop_event.wait(self._uptime_interval):
+            self.update_system_uptime()
+
+    def close(self):
+        """Stop the background uptime updates."""
+        self._stop_event.set()
+
     def export_metrics(self) -> bytes:
         """
         Export metrics in Prometheus format.
 
+        Output is cached for exposition_ttl seconds so concurrent scrapers
+        and dashboards don't each re-render the full registry.
+
         Returns:
             Prometheus-formatted metrics
         """
-        self.update_system_uptime()
-        return generate_latest(self.registry)
+        if time.monotonic() - self._exposition_ts < self.exposition_ttl:
+            return self._exposition_cache
+
+        if self._uptime_thread is None:
+            self.start_uptime_updates()
+
+        with self._exposition_lock:
+            # Another scraper may have refreshed while we waited
+            if time.monotonic() - self._exposition_ts < self.exposition_ttl:
+                return self._exposition_cache
+
+            _batcher.flush_all()
+            self._exposition_cache = generate_latest(self.registry)
+            self._exposition_ts = time.monotonic()
+            return self._exposition_cache
 
     def get_content_type(self) -> str:
         """Get Prometheus content type."""
@@ -366,6 +1015,71 @@ class MetricsCollector:
 # Decorators for Automatic Metrics
 # ============================================================================
 
+_TASK_STATUSES = ("success", "error")
+
+
+def _bind_children(resolve: Callable[[MetricsCollector], Any]) -> Callable[[], Any]:
+    """
+    Memoize the label children a decorator records into.
+
+    Children are resolved on first use and only re-resolved if
+    init_metrics() has since replaced the global collector, so the
+    wrapped call never pays for label lookups or a getter call.
+    """
+    bound: list = [None, None]
+
+    def children():
+        metrics = _global_metrics
+        if bound[0] is not metrics:
+            bound[1] = resolve(metrics)
+            bound[0] = metrics
+        return bound[1]
+
+    return children
+
+
+# Wrapper bodies for the tracking decorators. Each decorated coroutine
+# gets its own compiled copy with its dependencies (the wrapped function,
+# its bound children, perf_counter and the batcher's add) as plain names
+# in the generated code, so a call does no attribute lookups on modules
+# or the batcher.
+_STATUS_TRACKER_SOURCE = """
+async def wrapper(*args, **kwargs):
+    duration_child, status_children = children()
+    start_time = perf_counter()
+    status = "error"
+    try:
+        result = await func(*args, **kwargs)
+        status = "success"
+        return result
+    finally:
+        add(duration_child, perf_counter() - start_time)
+        add(status_children[status])
+"""
+
+_DURATION_TRACKER_SOURCE = """
+async def wrapper(*args, **kwargs):
+    duration_child = children()
+    start_time = perf_counter()
+    try:
+        return await func(*args, **kwargs)
+    finally:
+        add(duration_child, perf_counter() - start_time)
+"""
+
+
+def _compile_tracker(source: str, func: Callable, children: Callable[[], Any]) -> Callable:
+    """Compile a tracker wrapper specialised for func and its children."""
+    namespace = {
+        "func": func,
+        "children": children,
+        "perf_counter": time.perf_counter,
+        "add": _batcher.add,
+    }
+    exec(source, namespace)
+    return wraps(func)(namespace["wrapper"])
+
+
 def track_agent_task(agent_type: str, task_type: str):
     """
     Decorator to track agent task metrics.
@@ -375,32 +1089,21 @@ def track_agent_task(agent_type: str, task_type: str):
         async def analyze_workflow(self, workflow_json):
             ...
     """
-    def decorator(func: Callable):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            metrics = get_metrics_collector()
-            start_time = time.time()
-
-            try:
-                result = await func(*args, **kwargs)
-                status = "success"
-                return result
-            except Exception as e:
-                status = "error"
-                raise
-            finally:
-                duration = time.time() - start_time
-                metrics.agent_task_duration.labels(
-                    agent_type=agent_type,
-                    task_type=task_type
-                ).observe(duration)
-                metrics.agent_task_total.labels(
+    def resolve(metrics: MetricsCollector):
+        return (
+            metrics.agent_task_duration.labels(agent_type=agent_type, task_type=task_type),
+            {
+                status: metrics.agent_task_total.labels(
                     agent_type=agent_type,
                     task_type=task_type,
                     status=status
-                ).inc()
+                )
+                for status in _TASK_STATUSES
+            }
+        )
 
-        return wrapper
+    def decorator(func: Callable):
+        return _compile_tracker(_STATUS_TRACKER_SOURCE, func, _bind_children(resolve))
     return decorator
 
 
@@ -413,32 +1116,21 @@ def track_llm_request(provider: str, model: str):
         async def call_ollama(self, prompt):
             ...
     """
-    def decorator(func: Callable):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            metrics = get_metrics_collector()
-            start_time = time.time()
-
-            try:
-                result = await func(*args, **kwargs)
-                status = "success"
-                return result
-            except Exception as e:
-                status = "error"
-                raise
-            finally:
-                duration = time.time() - start_time
-                metrics.llm_request_duration.labels(
-                    provider=provider,
-                    model=model
-                ).observe(duration)
-                metrics.llm_request_total.labels(
+    def resolve(metrics: MetricsCollector):
+        return (
+            metrics.llm_request_duration.labels(provider=provider, model=model),
+            {
+                status: metrics.llm_request_total.labels(
                     provider=provider,
                     model=model,
                     status=status
-                ).inc()
+                )
+                for status in _TASK_STATUSES
+            }
+        )
 
-        return wrapper
+    def decorator(func: Callable):
+        return _compile_tracker(_STATUS_TRACKER_SOURCE, func, _bind_children(resolve))
     return decorator
 
 
@@ -451,27 +1143,11 @@ def track_memory_operation(operation: str, provider: str):
         async def store_memory(self, memory_type, content):
             ...
     """
-    def decorator(func: Callable):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            metrics = get_metrics_collector()
-            start_time = time.time()
-
-            try:
-                result = await func(*args, **kwargs)
-                status = "success"
-                return result
-            except Exception as e:
-                status = "error"
-                raise
-            finally:
-                duration = time.time() - start_time
-                metrics.memory_operation_duration.labels(
-                    operation=operation,
-                    provider=provider
-                ).observe(duration)
+    def resolve(metrics: MetricsCollector):
+        return metrics.memory_operation_duration.labels(operation=operation, provider=provider)
 
-        return wrapper
+    def decorator(func: Callable):
+        return _compile_tracker(_DURATION_TRACKER_SOURCE, func, _bind_children(resolve))
     return decorator
 
 
@@ -484,34 +1160,41 @@ def track_api_request(method: str, endpoint: str):
         async def create_workflow(request):
             ...
     """
+    def resolve(metrics: MetricsCollector):
+        @lru_cache(maxsize=16)
+        def status_child(status_code):
+            return metrics.api_request_total.labels(
+                method=method,
+                endpoint=endpoint,
+                status_code=_bounded_label(status_code, _ALLOWED_STATUS_CODES)
+            )
+
+        return (
+            metrics.api_active_requests.labels(endpoint=endpoint),
+            metrics.api_request_duration.labels(method=method, endpoint=endpoint),
+            status_child
+        )
+
     def decorator(func: Callable):
+        children = _bind_children(resolve)
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            metrics = get_metrics_collector()
-            start_time = time.time()
+            active_child, duration_child, status_child = children()
+            start_time = time.perf_counter()
+            status_code = 500
 
             # Track active requests
-            metrics.api_active_requests.labels(endpoint=endpoint).inc()
+            active_child.inc()
 
             try:
                 result = await func(*args, **kwargs)
                 status_code = getattr(result, 'status_code', 200)
                 return result
-            except Exception as e:
-                status_code = 500
-                raise
             finally:
-                duration = time.time() - start_time
-                metrics.api_request_duration.labels(
-                    method=method,
-                    endpoint=endpoint
-                ).observe(duration)
-                metrics.api_request_total.labels(
-                    method=method,
-                    endpoint=endpoint,
-                    status_code=status_code
-                ).inc()
-                metrics.api_active_requests.labels(endpoint=endpoint).dec()
+                _batcher.add(duration_child, time.perf_counter() - start_time)
+                _batcher.add(status_child(status_code))
+                active_child.dec()
 
         return wrapper
     return decorator
@@ -521,18 +1204,30 @@ def track_api_request(method: str, endpoint: str):
 # Global Metrics Collector
 # ============================================================================
 
-_global_metrics: Optional[MetricsCollector] = None
+# Created at import so lookups on the hot path never need a None check;
+# init_metrics() replaces it when a custom registry or settings are needed.
+_global_metrics: MetricsCollector = MetricsCollector()
 
 
-def init_metrics(registry: Optional[CollectorRegistry] = None) -> MetricsCollector:
+def init_metrics(
+    registry: Optional[CollectorRegistry] = None,
+    exposition_ttl: float = 1.0,
+    uptime_interval: float = 5.0,
+    enabled_families: Optional[Iterable[str]] = None
+) -> MetricsCollector:
     """Initialize global metrics collector."""
     global _global_metrics
-    _global_metrics = MetricsCollector(registry=registry)
+    _global_metrics.close()
+    _global_metrics = MetricsCollector(
+        registry=registry,
+        exposition_ttl=exposition_ttl,
+        uptime_interval=uptime_interval,
+        enabled_families=enabled_families
+    )
+    _global_metrics.start_uptime_updates()
     return _global_metrics
 
 
 def get_metrics_collector() -> MetricsCollector:
     """Get global metrics collector instance."""
-    if _global_metrics is None:
-        return init_metrics()
     return _global_metrics
@@ -12,19 +12,36 @@ Each agent maintains their expertise while adopting Terry's:
 """
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import random
+import re
+import time
+from collections import deque
+from typing import Deque, Dict, Any, List, Mapping, Optional, Sequence, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Module-private RNG for phrase selection, so persona formatting doesn't
+# share the global random state with the rest of the process.
+_rng = random.Random()
+
+
+def _iso(ns: int) -> str:
+    """Format a time.time_ns() timestamp as an ISO 8601 UTC string."""
+    return datetime.fromtimestamp(ns / 1e9, tz=timezone.utc).isoformat()
+
 
 # ============================================================================
 # Constitutional Framework
 # ============================================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ImmutablePrinciple:
     """Core principle that guides all agent behavior."""
     id: str
@@ -44,7 +61,8 @@ class ConstitutionalFramework:
     Modines-first approach with PhD-level excellence.
     """
 
-    PRINCIPLES = [
+    # Tuple: principles are immutable and iterated on every response
+    PRINCIPLES = (
         ImmutablePrinciple(
             id="modines_first",
             priority=1,
@@ -86,24 +104,28 @@ class ConstitutionalFramework:
             priority=7,
             description="Ensure all advice meets legal and compliance standards",
             enforcement="mandatory"
-        )
-    ]
+        ),
+    )
 
     @classmethod
-    def validate_response(cls, response_context: Dict[str, Any]) -> tuple[bool, List[str]]:
+    def validate_response(cls, response_context: Dict[str, Any]) -> tuple[bool, Sequence[str]]:
         """
         Validate a response against all constitutional principles.
 
         Returns:
-            Tuple of (is_valid, violations)
+            Tuple of (is_valid, violations); violations is an empty tuple
+            when the response is valid
         """
-        violations = []
+        failed = tuple(
+            principle for principle in cls.PRINCIPLES
+            if not principle.validate_action(response_context)
+        )
 
-        for principle in cls.PRINCIPLES:
-            if not principle.validate_action(response_context):
-                violations.append(f"Violation of {principle.id}: {principle.description}")
+        # Common path: nothing to report, so nothing to format
+        if not failed:
+            return True, ()
 
-        return len(violations) == 0, violations
+        return False, [f"Violation of {principle.id}: {principle.description}" for principle in failed]
 
 
 # ============================================================================
@@ -153,6 +175,19 @@ class VoiceCharacteristics:
         "You got it, boss"
     ]
 
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _interpolated_patterns(agent_name: str, context: str) -> tuple[str, ...]:
+        """Phrase patterns for a context, pre-formatted with the agent name."""
+        if context == "thinking":
+            patterns = VoiceCharacteristics.THINKING_PHRASES
+        elif context == "confirmation":
+            patterns = VoiceCharacteristics.CONFIRMATION_PHRASES
+        else:
+            patterns = VoiceCharacteristics.SELF_REFERENCE_PATTERNS
+
+        return tuple(pattern.format(name=agent_name) for pattern in patterns)
+
     @staticmethod
     def format_third_person(agent_name: str, message: str, context: str = "thinking") -> str:
         """
@@ -166,19 +201,8 @@ class VoiceCharacteristics:
         Returns:
             Formatted message in third-person
         """
-        if context == "thinking":
-            patterns = VoiceCharacteristics.THINKING_PHRASES
-        elif context == "confirmation":
-            patterns = VoiceCharacteristics.CONFIRMATION_PHRASES
-        else:
-            patterns = VoiceCharacteristics.SELF_REFERENCE_PATTERNS
-
-        # Select appropriate pattern
-        import random
-        pattern = random.choice(patterns)
-
-        # Format with agent name
-        prefix = pattern.format(name=agent_name)
+        # Select appropriate pattern, already formatted with agent name
+        prefix = _rng.choice(VoiceCharacteristics._interpolated_patterns(agent_name, context))
 
         return f"{prefix} {message}"
 
@@ -196,11 +220,11 @@ class StakeholderType(str, Enum):
     MODINES = "modines"  # Primary user - highest priority
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StakeholderProfile:
     """Profile for stakeholder-specific communication."""
     stakeholder_type: StakeholderType
-    focus_areas: List[str]
+    focus_areas: Tuple[str, ...]
     language_style: str
     technical_depth: str
 
@@ -219,36 +243,41 @@ class StakeholderDetector:
     PROFILES = {
         StakeholderType.EXECUTIVE: StakeholderProfile(
             stakeholder_type=StakeholderType.EXECUTIVE,
-            focus_areas=["strategic_value", "roi", "competitive_positioning"],
+            focus_areas=("strategic_value", "roi", "competitive_positioning"),
             language_style="high_level_decisive",
             technical_depth="strategic_overview"
         ),
         StakeholderType.TECHNICAL_TEAM: StakeholderProfile(
             stakeholder_type=StakeholderType.TECHNICAL_TEAM,
-            focus_areas=["implementation_depth", "architecture", "methodology"],
+            focus_areas=("implementation_depth", "architecture", "methodology"),
             language_style="detailed_technical",
             technical_depth="deep_dive"
         ),
         StakeholderType.END_USER: StakeholderProfile(
             stakeholder_type=StakeholderType.END_USER,
-            focus_areas=["simplicity", "reliability", "user_satisfaction"],
+            focus_areas=("simplicity", "reliability", "user_satisfaction"),
             language_style="accessible_clear",
             technical_depth="minimal_appropriate"
         ),
         StakeholderType.CLIENT: StakeholderProfile(
             stakeholder_type=StakeholderType.CLIENT,
-            focus_areas=["competence", "value_delivery", "trust"],
+            focus_areas=("competence", "value_delivery", "trust"),
             language_style="professional_confident",
             technical_depth="selective_detailed"
         ),
         StakeholderType.MODINES: StakeholderProfile(
             stakeholder_type=StakeholderType.MODINES,
-            focus_areas=["wellbeing", "success", "growth", "complete_transparency"],
+            focus_areas=("wellbeing", "success", "growth", "complete_transparency"),
             language_style="personal_devoted_street_smart",
             technical_depth="full_context_adaptive"
         )
     }
 
+    # Query-type keywords, checked in priority order
+    _EXECUTIVE_RE = re.compile(r"strategy|roi|business", re.IGNORECASE)
+    _TECHNICAL_RE = re.compile(r"implementation|architecture|technical", re.IGNORECASE)
+    _END_USER_RE = re.compile(r"simple|how to|help", re.IGNORECASE)
+
     @classmethod
     def detect_stakeholder(cls, context: Dict[str, Any]) -> StakeholderProfile:
         """
@@ -260,19 +289,17 @@ class StakeholderDetector:
         Returns:
             Appropriate stakeholder profile
         """
-        user_id = context.get("user_id", "").lower()
-        query_type = context.get("query_type", "")
-
         # Modines always gets highest priority
-        if "modines" in user_id or context.get("primary_user"):
+        if context.get("primary_user") or "modines" in context.get("user_id", "").lower():
             return cls.PROFILES[StakeholderType.MODINES]
 
         # Detect based on query characteristics
-        if any(kw in query_type.lower() for kw in ["strategy", "roi", "business"]):
+        query_type = context.get("query_type", "")
+        if cls._EXECUTIVE_RE.search(query_type):
             return cls.PROFILES[StakeholderType.EXECUTIVE]
-        elif any(kw in query_type.lower() for kw in ["implementation", "architecture", "technical"]):
+        elif cls._TECHNICAL_RE.search(query_type):
             return cls.PROFILES[StakeholderType.TECHNICAL_TEAM]
-        elif any(kw in query_type.lower() for kw in ["simple", "how to", "help"]):
+        elif cls._END_USER_RE.search(query_type):
             return cls.PROFILES[StakeholderType.END_USER]
         else:
             return cls.PROFILES[StakeholderType.CLIENT]
@@ -323,7 +350,7 @@ class MetacognitivePhase(str, Enum):
     FINAL_SYNTHESIS = "final_synthesis"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MetacognitiveStep:
     """A step in the metacognitive reasoning process."""
     phase: MetacognitivePhase
@@ -382,6 +409,14 @@ class MetacognitivePrompting:
         )
     ]
 
+    _STEPS = tuple(FRAMEWORK)
+    _PHASE_KEYS = tuple(step.phase.value for step in FRAMEWORK)
+
+    # (phase, agent_name) -> read-only phase result, shared by every
+    # analysis; the roster of agents is small and fixed, so this never
+    # needs evicting
+    _phase_results: Dict[Tuple[str, str], Mapping[str, Any]] = {}
+
     @classmethod
     def apply_framework(cls, agent_name: str, query: str, initial_response: str) -> Dict[str, Any]:
         """
@@ -393,19 +428,20 @@ class MetacognitivePrompting:
             initial_response: Initial response from agent
 
         Returns:
-            Enhanced response with metacognitive validation
+            Enhanced response with metacognitive validation; the per-phase
+            entries are shared read-only mappings
         """
+        # Phase order is fixed, so the analysis is built in one dict() call
         result = {
             "original_response": initial_response,
-            "metacognitive_analysis": {},
+            "metacognitive_analysis": dict(zip(
+                cls._PHASE_KEYS,
+                [cls._execute_phase(agent_name, step, query, initial_response) for step in cls._STEPS]
+            )),
             "final_response": "",
             "confidence_level": 0.0
         }
 
-        for step in cls.FRAMEWORK:
-            phase_result = cls._execute_phase(agent_name, step, query, initial_response)
-            result["metacognitive_analysis"][step.phase.value] = phase_result
-
         # Synthesize final response
         result["final_response"] = cls._synthesize_response(agent_name, result)
         result["confidence_level"] = cls._calculate_confidence(result)
@@ -419,14 +455,20 @@ class MetacognitivePrompting:
         step: MetacognitiveStep,
         query: str,
         response: str
-    ) -> Dict[str, Any]:
+    ) -> Mapping[str, Any]:
         """Execute a single metacognitive phase."""
-        return {
-            "phase": step.phase.value,
-            "description": step.description,
-            "completed_actions": step.actions,
-            "reflections": [q.format(name=agent_name) for q in step.questions]
-        }
+        key = (step.phase.value, agent_name)
+        phase_result = cls._phase_results.get(key)
+        if phase_result is None:
+            phase_result = MappingProxyType({
+                "phase": step.phase.value,
+                "description": step.description,
+                "completed_actions": tuple(step.actions),
+                "reflections": tuple(q.format(name=agent_name) for q in step.questions)
+            })
+            cls._phase_results[key] = phase_result
+
+        return phase_result
 
     @classmethod
     def _synthesize_response(cls, agent_name: str, analysis: Dict[str, Any]) -> str:
@@ -456,16 +498,32 @@ class BioInspiredLearning:
         Only 20% of knowledge pathways active at once.
 
         Args:
-            knowledge_base: Full knowledge base
-            context: Current context
+            knowledge_base: Full knowledge base, stored column-wise as
+                {"keys": [...], "embeddings": (N, d) float32 array, "values": [...]}
+            context: Current context; its "embedding" vector drives the gating
 
         Returns:
-            Activated subset of knowledge
+            Activated subset of knowledge as {key: value}
         """
-        # Implementation: Select relevant knowledge based on context
         activation_percentage = 0.20
-        # Placeholder: In production, use semantic similarity, relevance scoring
-        return knowledge_base
+        keys = knowledge_base["keys"]
+        values = knowledge_base["values"]
+
+        context_vec = context.get("embedding")
+        if context_vec is None:
+            # Nothing to score relevance against: everything stays active
+            return dict(zip(keys, values))
+
+        # One matrix-vector product scores every entry by similarity
+        embeddings = np.asarray(knowledge_base["embeddings"], dtype=np.float32)
+        scores = embeddings @ np.asarray(context_vec, dtype=np.float32)
+
+        k = max(1, int(activation_percentage * len(scores)))
+        if k >= len(scores):
+            return dict(zip(keys, values))
+
+        top_k = np.argpartition(scores, -k)[-k:]
+        return {keys[i]: values[i] for i in top_k}
 
     @staticmethod
     def simulated_sleep_consolidation(interaction_history: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -486,11 +544,48 @@ class BioInspiredLearning:
             "insights_generated": []
         }
 
-        # Pattern replay and consolidation
-        # Placeholder: In production, implement sophisticated pattern extraction
+        if not interaction_history:
+            return consolidation_result
+
+        # Pattern replay: flatten the history into integer id columns so the
+        # co-occurrence count runs as one C loop instead of per-dict Python
+        n = len(interaction_history)
+        query_ids: Dict[str, int] = {}
+        stakeholder_ids: Dict[str, int] = {}
+        queries = np.fromiter(
+            (query_ids.setdefault(i["query"], len(query_ids)) for i in interaction_history),
+            dtype=np.int64, count=n
+        )
+        stakeholders = np.fromiter(
+            (stakeholder_ids.setdefault(i["stakeholder"], len(stakeholder_ids)) for i in interaction_history),
+            dtype=np.int64, count=n
+        )
+
+        n_queries = len(query_ids)
+        counts = BioInspiredLearning._pattern_counts(stakeholders, queries, n_queries)
+
+        # A (stakeholder, query) pair seen more than once is a pattern
+        repeated = np.flatnonzero(counts > 1)
+        repeated = repeated[np.argsort(counts[repeated], kind="stable")[::-1]]
+
+        query_names = list(query_ids)
+        stakeholder_names = list(stakeholder_ids)
+        consolidation_result["patterns_identified"] = [
+            {
+                "stakeholder": stakeholder_names[code // n_queries],
+                "query": query_names[code % n_queries],
+                "count": int(counts[code])
+            }
+            for code in repeated
+        ]
 
         return consolidation_result
 
+    @staticmethod
+    def _pattern_counts(stakeholders: np.ndarray, queries: np.ndarray, n_queries: int) -> np.ndarray:
+        """Count (stakeholder, query) co-occurrences, indexed by stakeholder * n_queries + query."""
+        return np.bincount(stakeholders * n_queries + queries)
+
 
 # ============================================================================
 # Agent Persona Base Class
@@ -537,8 +632,18 @@ class TerryPersonaAgent:
         self.metacognitive = MetacognitivePrompting()
         self.bio_learning = BioInspiredLearning()
 
-        # Interaction history for learning
-        self.interaction_history: List[Dict[str, Any]] = []
+        # Interaction history for learning, bounded to the most recent
+        # interactions; older ones go to the optional cold store (any object
+        # with append_batch(list)) when learning is consolidated
+        self.interaction_history: Deque[Dict[str, Any]] = deque(
+            maxlen=agent_config.get("history_size", 10_000)
+        )
+        self._cold_store = agent_config.get("cold_store")
+
+        # Per-agent RNG and phrase templates for the voice helpers below
+        self._rng = random.Random()
+        self._thinking_templates = tuple(self.voice.THINKING_PHRASES)
+        self._confirmation_templates = tuple(self.voice.CONFIRMATION_PHRASES)
 
         logger.info(f"Initialized Terry persona agent: {agent_name} ({agent_nickname})")
 
@@ -591,7 +696,7 @@ class TerryPersonaAgent:
 
         # Step 6: Store interaction for learning
         self.interaction_history.append({
-            "timestamp": datetime.utcnow(),
+            "timestamp": time.time_ns(),
             "query": query,
             "response": adapted_response,
             "stakeholder": stakeholder_profile.stakeholder_type.value,
@@ -626,20 +731,28 @@ class TerryPersonaAgent:
         Should be called periodically (e.g., end of session, daily).
         """
         if len(self.interaction_history) > 0:
-            consolidation = self.bio_learning.simulated_sleep_consolidation(
-                self.interaction_history
-            )
+            history = list(self.interaction_history)
+            consolidation = self.bio_learning.simulated_sleep_consolidation(history)
             logger.info(f"{self.agent_nickname} completed learning consolidation")
             logger.debug(f"Consolidation result: {consolidation}")
 
+            if self._cold_store is not None:
+                self._cold_store.append_batch(history)
+                self.interaction_history.clear()
+
+    def export_interaction_history(self) -> List[Dict[str, Any]]:
+        """Get the interaction history with timestamps as ISO 8601 strings."""
+        return [
+            {**interaction, "timestamp": _iso(interaction["timestamp"])}
+            for interaction in self.interaction_history
+        ]
+
     def get_thinking_indicator(self) -> str:
         """Get a thinking indicator phrase for this agent."""
-        import random
-        phrase = random.choice(self.voice.THINKING_PHRASES)
-        return phrase.format(name=self.agent_nickname)
+        templates = self._thinking_templates
+        return templates[self._rng.randrange(len(templates))].format(name=self.agent_nickname)
 
     def get_confirmation_phrase(self) -> str:
         """Get a confirmation phrase for this agent."""
-        import random
-        phrase = random.choice(self.voice.CONFIRMATION_PHRASES)
-        return phrase.format(name=self.agent_nickname)
+        templates = self._confirmation_templates
+        return templates[self._rng.randrange(len(templates))].format(name=self.agent_nickname)
@@ -3,21 +3,117 @@ Production-grade rate limiting middleware for Dell Boca Boys V2.
 Implements token bucket and sliding window algorithms with Redis backend.
 """
 import asyncio
+import os
+import threading
 import time
 import hashlib
-from typing import Optional, Callable, Dict, Any
+import math
+from types import MappingProxyType
+from typing import Optional, Callable, Dict, Any, List, Mapping, Tuple
 from dataclasses import dataclass
 from functools import wraps
 import logging
 
 import redis.asyncio as aioredis
+from redis.exceptions import NoScriptError
 
 from core.exceptions import RateLimitExceededError
 
+# Conditional import: xxhash is optional.  Without it, key ids fall back
+# to the stdlib's blake2b, which is slower but produces keys just as short.
+try:
+    import xxhash  # type: ignore
+    _HAS_XXHASH = True
+except Exception:
+    xxhash = None  # type: ignore
+    _HAS_XXHASH = False
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _kid(identifier: str) -> str:
+    """
+    Derive a fixed-length Redis key id from an identifier.
+
+    Identifiers can be long (API tokens, user agents) and this is not a
+    security boundary, so a fast non-cryptographic 64-bit hash is enough.
+    """
+    if _HAS_XXHASH:
+        return xxhash.xxh3_64_hexdigest(identifier)
+    return hashlib.blake2b(identifier.encode(), digest_size=8).hexdigest()
+
+
+# ============================================================================
+# Lua Scripts
+# ============================================================================
+# Registered per client with register_script(): calls go out as EVALSHA
+# and the script body is only (re)sent on a NOSCRIPT reply, e.g. after a
+# Redis restart or SCRIPT FLUSH.
+
+# Atomic token bucket operations; state is one string "<tokens>:<last_refill_us>"
+TOKEN_BUCKET_LUA = """
+local key = KEYS[1]
+local capacity = tonumber(ARGV[1])
+local refill_per_us = tonumber(ARGV[2])
+local tokens_requested = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])  -- integer microseconds
+
+local tokens = capacity
+local last_refill = now
+local state = redis.call('GET', key)
+if state then
+    local sep = string.find(state, ':', 1, true)
+    tokens = tonumber(string.sub(state, 1, sep - 1))
+    last_refill = tonumber(string.sub(state, sep + 1))
+end
+
+-- Refill tokens based on elapsed time (microseconds)
+local elapsed = now - last_refill
+local tokens_to_add = elapsed * refill_per_us
+tokens = math.min(capacity, tokens + tokens_to_add)
+
+-- Check if enough tokens available
+local allowed = 0
+if tokens >= tokens_requested then
+    tokens = tokens - tokens_requested
+    allowed = 1
+end
+
+-- %.17g round-trips the token count exactly (fixed decimals would drop
+-- sub-1e-6 refills at low rates); %d keeps the microsecond timestamp exact
+redis.call('SET', key, string.format('%.17g:%d', tokens, now), 'EX', 3600)  -- 1 hour expiry
+return {allowed, tokens, now}
+"""
+
+# Atomic sliding window operations
+SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local window_start = tonumber(ARGV[1])  -- integer microseconds
+local now = tonumber(ARGV[2])           -- integer microseconds
+local limit = tonumber(ARGV[3])
+local window = tonumber(ARGV[4])        -- seconds, for the key expiry
+
+-- Remove old entries outside the window
+redis.call('ZREMRANGEBYSCORE', key, '-inf', window_start)
+
+-- Count requests in current window
+local count = redis.call('ZCARD', key)
+
+if count < limit then
+    -- Add current request
+    redis.call('ZADD', key, now, now)
+    redis.call('EXPIRE', key, window * 2)
+    return {1, count + 1}  -- Allowed
+else
+    -- Oldest timestamp (as its string score, so no integer truncation)
+    -- lets the caller compute retry_after without a second round-trip
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    return {0, count, oldest[2] or ARGV[2]}  -- Not allowed
+end
+"""
+
+
+@dataclass(frozen=True, slots=True)
 class RateLimitConfig:
     """Rate limit configuration."""
     requests: int  # Number of requests
@@ -25,6 +121,85 @@ class RateLimitConfig:
     burst: Optional[int] = None  # Burst capacity (for token bucket)
 
 
+# ============================================================================
+# Script Batching
+# ============================================================================
+
+class _ScriptBatcher:
+    """
+    Coalesces concurrent rate limit script calls into pipelined round-trips.
+
+    Calls submitted within ``window`` seconds of each other go out as one
+    non-transactional pipeline of EVALSHAs (at most ``max_batch`` per
+    round-trip) and each caller's future is resolved with its own reply.
+    A call that finds no other call pending is sent at once, without
+    waiting out the window. EVALSHAs are queued on the pipeline directly
+    (not through the Script object, which would make the pipeline send
+    SCRIPT EXISTS first); scripts are loaded only on a NOSCRIPT reply.
+    """
+
+    def __init__(self, redis_client: aioredis.Redis, window: float = 0.001, max_batch: int = 256):
+        self.redis = redis_client
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[Any, str, List[str], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def submit(self, script, key: str, args: List[str]) -> asyncio.Future:
+        """Queue a script call; the returned future resolves to its reply."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((script, key, args, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._run())
+        return future
+
+    async def _run(self):
+        try:
+            while self._pending:
+                if 1 < len(self._pending) < self.max_batch:
+                    await asyncio.sleep(self.window)
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+                await self._execute(batch)
+        finally:
+            self._flush_task = None
+
+    async def _execute(self, batch):
+        try:
+            results = await self._evalsha_many(batch)
+
+            # Scripts missing after a Redis restart or SCRIPT FLUSH: load
+            # each once and resend only the calls that hit NOSCRIPT
+            retry = [i for i, result in enumerate(results) if isinstance(result, NoScriptError)]
+            if retry:
+                for script in {batch[i][0] for i in retry}:
+                    await self.redis.script_load(script.script)
+                for i, result in zip(retry, await self._evalsha_many([batch[i] for i in retry])):
+                    results[i] = result
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, _, _, future), result in zip(batch, results):
+            if future.done():  # Caller was cancelled
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def _evalsha_many(self, batch) -> list:
+        """Send one pipeline of EVALSHAs; errors are returned in place."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for script, key, args, _ in batch:
+                pipe.evalsha(script.sha, 1, key, *args)
+            return await pipe.execute(raise_on_error=False)
+
+    async def drain(self):
+        """Wait until every submitted call has been sent and answered."""
+        while self._flush_task is not None:
+            await asyncio.shield(self._flush_task)
+
+
 class TokenBucketRateLimiter:
     """
     Token bucket rate limiter with Redis backend.
@@ -37,7 +212,8 @@ class TokenBucketRateLimiter:
         self,
         redis_client: aioredis.Redis,
         rate_config: RateLimitConfig,
-        key_prefix: str = "rate_limit"
+        key_prefix: str = "rate_limit",
+        batcher: Optional[_ScriptBatcher] = None
     ):
         """
         Initialize token bucket rate limiter.
@@ -46,10 +222,13 @@ class TokenBucketRateLimiter:
             redis_client: Async Redis client
             rate_config: Rate limit configuration
             key_prefix: Redis key prefix
+            batcher: Optional batcher to pipeline script calls through
         """
         self.redis = redis_client
         self.config = rate_config
         self.key_prefix = key_prefix
+        self._script = redis_client.register_script(TOKEN_BUCKET_LUA)
+        self._batcher = batcher
 
         # Calculate tokens per second
         self.refill_rate = rate_config.requests / rate_config.window
@@ -57,6 +236,11 @@ class TokenBucketRateLimiter:
         # Burst capacity (defaults to rate if not specified)
         self.capacity = rate_config.burst or rate_config.requests
 
+        # Script arguments that never change, stringified once; time is
+        # passed as integer microseconds so the refill rate is per µs
+        self._capacity_s = str(self.capacity)
+        self._refill_per_us = str(self.refill_rate / 1_000_000)
+
         logger.info(
             f"Token bucket rate limiter initialized: "
             f"{rate_config.requests} req/{rate_config.window}s, "
@@ -75,52 +259,24 @@ class TokenBucketRateLimiter:
             Tuple of (allowed, metadata)
             metadata contains: remaining, reset_time, retry_after
         """
-        key = f"{self.key_prefix}:token_bucket:{identifier}"
-        now = time.time()
-
-        # Lua script for atomic token bucket operations
-        lua_script = """
-        local key = KEYS[1]
-        local capacity = tonumber(ARGV[1])
-        local refill_rate = tonumber(ARGV[2])
-        local tokens_requested = tonumber(ARGV[3])
-        local now = tonumber(ARGV[4])
-
-        local bucket = redis.call('HMGET', key, 'tokens', 'last_refill')
-        local tokens = tonumber(bucket[1]) or capacity
-        local last_refill = tonumber(bucket[2]) or now
-
-        -- Refill tokens based on elapsed time
-        local elapsed = now - last_refill
-        local tokens_to_add = elapsed * refill_rate
-        tokens = math.min(capacity, tokens + tokens_to_add)
-
-        -- Check if enough tokens available
-        if tokens >= tokens_requested then
-            tokens = tokens - tokens_requested
-            redis.call('HMSET', key, 'tokens', tokens, 'last_refill', now)
-            redis.call('EXPIRE', key, 3600)  -- 1 hour expiry
-            return {1, tokens, now}  -- Allowed
-        else
-            redis.call('HMSET', key, 'tokens', tokens, 'last_refill', now)
-            redis.call('EXPIRE', key, 3600)
-            return {0, tokens, now}  -- Not allowed
-        end
-        """
+        key = f"{self.key_prefix}:tb:{_kid(identifier)}"
+        now_us = time.time_ns() // 1000
 
-        result = await self.redis.eval(
-            lua_script,
-            1,
-            key,
-            str(self.capacity),
-            str(self.refill_rate),
+        args = [
+            self._capacity_s,
+            self._refill_per_us,
             str(tokens),
-            str(now)
-        )
+            str(now_us)
+        ]
+
+        if self._batcher is not None:
+            result = await self._batcher.submit(self._script, key, args)
+        else:
+            result = await self._script(keys=[key], args=args)
 
         allowed = bool(result[0])
         remaining_tokens = float(result[1])
-        last_refill = float(result[2])
+        last_refill = int(result[2]) // 1_000_000
 
         # Calculate retry_after (seconds until enough tokens available)
         if not allowed:
@@ -138,6 +294,9 @@ class TokenBucketRateLimiter:
 
         return allowed, metadata
 
+    # Uniform (identifier, tokens) entry point used by RateLimiter
+    _is_allowed = is_allowed
+
 
 class SlidingWindowRateLimiter:
     """
@@ -151,7 +310,8 @@ class SlidingWindowRateLimiter:
         self,
         redis_client: aioredis.Redis,
         rate_config: RateLimitConfig,
-        key_prefix: str = "rate_limit"
+        key_prefix: str = "rate_limit",
+        batcher: Optional[_ScriptBatcher] = None
     ):
         """
         Initialize sliding window rate limiter.
@@ -160,10 +320,18 @@ class SlidingWindowRateLimiter:
             redis_client: Async Redis client
             rate_config: Rate limit configuration
             key_prefix: Redis key prefix
+            batcher: Optional batcher to pipeline script calls through
         """
         self.redis = redis_client
         self.config = rate_config
         self.key_prefix = key_prefix
+        self._script = redis_client.register_script(SLIDING_WINDOW_LUA)
+        self._batcher = batcher
+
+        # Script arguments that never change, stringified once
+        self._window_us = rate_config.window * 1_000_000
+        self._limit_s = str(rate_config.requests)
+        self._window_s = str(rate_config.window)
 
         logger.info(
             f"Sliding window rate limiter initialized: "
@@ -180,68 +348,145 @@ class SlidingWindowRateLimiter:
         Returns:
             Tuple of (allowed, metadata)
         """
-        key = f"{self.key_prefix}:sliding_window:{identifier}"
-        now = time.time()
-        window_start = now - self.config.window
-
-        # Lua script for atomic sliding window operations
-        lua_script = """
-        local key = KEYS[1]
-        local window_start = tonumber(ARGV[1])
-        local now = tonumber(ARGV[2])
-        local limit = tonumber(ARGV[3])
-        local window = tonumber(ARGV[4])
-
-        -- Remove old entries outside the window
-        redis.call('ZREMRANGEBYSCORE', key, '-inf', window_start)
-
-        -- Count requests in current window
-        local count = redis.call('ZCARD', key)
-
-        if count < limit then
-            -- Add current request
-            redis.call('ZADD', key, now, now)
-            redis.call('EXPIRE', key, window * 2)
-            return {1, count + 1}  -- Allowed
-        else
-            return {0, count}  -- Not allowed
-        end
-        """
-
-        result = await self.redis.eval(
-            lua_script,
-            1,
-            key,
-            str(window_start),
-            str(now),
-            str(self.config.requests),
-            str(self.config.window)
-        )
+        key = f"{self.key_prefix}:sw:{_kid(identifier)}"
+        now_us = time.time_ns() // 1000
+
+        args = [
+            str(now_us - self._window_us),
+            str(now_us),
+            self._limit_s,
+            self._window_s
+        ]
+
+        if self._batcher is not None:
+            result = await self._batcher.submit(self._script, key, args)
+        else:
+            result = await self._script(keys=[key], args=args)
 
         allowed = bool(result[0])
         current_count = int(result[1])
 
-        # Calculate retry_after
+        # Calculate retry_after from the oldest request timestamp
         if not allowed:
-            # Get oldest request timestamp
-            oldest = await self.redis.zrange(key, 0, 0, withscores=True)
-            if oldest:
-                oldest_time = oldest[0][1]
-                retry_after = int((oldest_time + self.config.window) - now) + 1
-            else:
-                retry_after = self.config.window
+            oldest_us = int(float(result[2]))
+            retry_after = (oldest_us + self._window_us - now_us) // 1_000_000 + 1
         else:
             retry_after = 0
 
         metadata = {
             "remaining": max(0, self.config.requests - current_count),
             "limit": self.config.requests,
-            "reset_time": int(now + self.config.window),
+            "reset_time": now_us // 1_000_000 + self.config.window,
+            "retry_after": retry_after
+        }
+
+        return allowed, metadata
+
+    async def _is_allowed(self, identifier: str, tokens: int = 1) -> tuple[bool, Dict[str, Any]]:
+        """Uniform (identifier, tokens) entry point; every request counts once."""
+        return await self.is_allowed(identifier)
+
+
+class InProcessTokenBucket:
+    """
+    Token bucket rate limiter kept in process memory.
+
+    For limiters that need no cross-process coordination (e.g. a single
+    worker guarding heavy processing): same semantics and metadata as
+    TokenBucketRateLimiter, without a Redis round-trip per check.
+    """
+
+    def __init__(self, rate_config: RateLimitConfig):
+        """
+        Initialize in-process token bucket rate limiter.
+
+        Args:
+            rate_config: Rate limit configuration
+        """
+        self.config = rate_config
+        self.refill_rate = rate_config.requests / rate_config.window
+        self.capacity = rate_config.burst or rate_config.requests
+
+        # identifier -> [tokens, last_refill (monotonic)]
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+        # A bucket idle this long has refilled to capacity, which is exactly
+        # the state a new bucket starts in, so it can be dropped. Swept at
+        # most once per that interval.
+        self._full_after = self.capacity / self.refill_rate
+        self._next_sweep = time.monotonic() + self._full_after
+
+        logger.info(
+            f"In-process token bucket rate limiter initialized: "
+            f"{rate_config.requests} req/{rate_config.window}s, "
+            f"burst={self.capacity}"
+        )
+
+    async def is_allowed(self, identifier: str, tokens: int = 1) -> tuple[bool, Dict[str, Any]]:
+        """
+        Check if request is allowed under rate limit.
+
+        Args:
+            identifier: Unique identifier (user_id, IP, etc.)
+            tokens: Number of tokens to consume
+
+        Returns:
+            Tuple of (allowed, metadata)
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+            bucket = self._buckets.get(identifier)
+            if bucket is None:
+                bucket = self._buckets[identifier] = [float(self.capacity), now]
+
+            # Refill tokens based on elapsed time
+            bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill_rate)
+            bucket[1] = now
+
+            allowed = bucket[0] >= tokens
+            if allowed:
+                bucket[0] -= tokens
+            remaining_tokens = bucket[0]
+
+        if not allowed:
+            retry_after = int((tokens - remaining_tokens) / self.refill_rate) + 1
+        else:
+            retry_after = 0
+
+        metadata = {
+            "remaining": int(remaining_tokens),
+            "limit": self.config.requests,
+            "reset_time": int(time.time()) + self.config.window,
             "retry_after": retry_after
         }
 
         return allowed, metadata
 
+    def _sweep(self, now: float):
+        """Drop buckets that have refilled to capacity (caller holds the lock)."""
+        cutoff = now - self._full_after
+        self._buckets = {
+            identifier: bucket for identifier, bucket in self._buckets.items()
+            if bucket[1] > cutoff
+        }
+        self._next_sweep = now + self._full_after
+
+    # Uniform (identifier, tokens) entry point used by RateLimiter
+    _is_allowed = is_allowed
+
+
+# A denied identifier is answered from process memory for at most this
+# long (or its retry_after, if shorter) instead of asking Redis again.
+# Only denials that left nothing in the bucket are cached, per token cost,
+# so a cheaper request is never refused on behalf of a costlier one.
+DENY_CACHE_MAX_TTL = 5.0
+DENY_CACHE_MAX_SIZE = 10_000
+
 
 class RateLimiter:
     """
@@ -262,10 +507,27 @@ class RateLimiter:
         Args:
             redis_url: Redis connection URL
         """
-        self.redis = aioredis.from_url(redis_url, decode_responses=False)
+        self.redis = aioredis.from_url(
+            redis_url,
+            decode_responses=False,
+            socket_keepalive=True,
+            health_check_interval=30,
+            max_connections=min(512, (os.cpu_count() or 1) * 32)
+        )
         self.limiters: Dict[str, Any] = {}
         self.logger = logging.getLogger(__name__)
 
+        # Read-only snapshot of limiters, taken by freeze() once setup is done
+        self._frozen: Optional[Mapping[str, Any]] = None
+
+        # Shared by all limiters so concurrent checks share round-trips
+        self._batcher = _ScriptBatcher(self.redis)
+
+        # (limiter_name, identifier, tokens) -> (monotonic expiry, monotonic
+        # retry deadline, deny metadata); insertion-ordered, so the oldest
+        # entry is evicted first
+        self._deny_cache: Dict[Tuple[str, str, int], Tuple[float, float, Dict[str, Any]]] = {}
+
     def create_limiter(
         self,
         name: str,
@@ -278,16 +540,24 @@ class RateLimiter:
         Args:
             name: Limiter name/identifier
             rate_config: Rate limit configuration
-            algorithm: "token_bucket" or "sliding_window"
+            algorithm: "token_bucket", "sliding_window", or "token_bucket_local"
+                (in-process, for limits that need no cross-process coordination)
         """
         if algorithm == "token_bucket":
-            limiter = TokenBucketRateLimiter(self.redis, rate_config, key_prefix=f"rate_limit:{name}")
+            limiter = TokenBucketRateLimiter(
+                self.redis, rate_config, key_prefix=f"rate_limit:{name}", batcher=self._batcher
+            )
         elif algorithm == "sliding_window":
-            limiter = SlidingWindowRateLimiter(self.redis, rate_config, key_prefix=f"rate_limit:{name}")
+            limiter = SlidingWindowRateLimiter(
+                self.redis, rate_config, key_prefix=f"rate_limit:{name}", batcher=self._batcher
+            )
+        elif algorithm == "token_bucket_local":
+            limiter = InProcessTokenBucket(rate_config)
         else:
             raise ValueError(f"Unknown algorithm: {algorithm}")
 
         self.limiters[name] = limiter
+        self._frozen = None
         self.logger.info(f"Created {algorithm} rate limiter: {name}")
         return limiter
 
@@ -311,18 +581,51 @@ class RateLimiter:
         Raises:
             ValueError: If limiter not found
         """
-        if limiter_name not in self.limiters:
+        limiters = self._frozen if self._frozen is not None else self.limiters
+        limiter = limiters.get(limiter_name)
+        if limiter is None:
             raise ValueError(f"Rate limiter not found: {limiter_name}")
 
-        limiter = self.limiters[limiter_name]
+        # Recently denied: skip the Redis round-trip
+        cache_key = (limiter_name, identifier, tokens)
+        hit = self._deny_cache.get(cache_key)
+        if hit is not None:
+            now = time.monotonic()
+            if hit[0] > now:
+                return False, {**hit[2], "retry_after": math.ceil(hit[1] - now)}
+            del self._deny_cache[cache_key]
 
-        if isinstance(limiter, TokenBucketRateLimiter):
-            return await limiter.is_allowed(identifier, tokens)
-        else:
-            return await limiter.is_allowed(identifier)
+        allowed, metadata = await limiter._is_allowed(identifier, tokens)
+
+        if not allowed and metadata["remaining"] == 0:
+            self._cache_denial(cache_key, metadata)
+
+        return allowed, metadata
+
+    def freeze(self):
+        """
+        Snapshot the configured limiters into a read-only mapping.
+
+        Call once all limiters are created; creating another limiter
+        afterwards drops the snapshot until freeze() is called again.
+        """
+        self._frozen = MappingProxyType(dict(self.limiters))
+
+    def _cache_denial(self, cache_key: Tuple[str, str, int], metadata: Dict[str, Any]):
+        """Remember a denial until its retry_after (capped) elapses."""
+        now = time.monotonic()
+        retry_after = metadata["retry_after"]
+        self._deny_cache.pop(cache_key, None)
+        self._deny_cache[cache_key] = (
+            now + min(retry_after, DENY_CACHE_MAX_TTL), now + retry_after, metadata
+        )
+
+        if len(self._deny_cache) > DENY_CACHE_MAX_SIZE:
+            del self._deny_cache[next(iter(self._deny_cache))]
 
     async def close(self):
         """Close Redis connection."""
+        await self._batcher.drain()
         await self.redis.close()
 
 
@@ -3,61 +3,115 @@ Production-grade Role-Based Access Control (RBAC) system with JWT authentication
 Implements fine-grained permissions, role hierarchies, and audit logging.
 """
 import os
+import ssl
+import asyncio
+import base64
+import binascii
+import hmac
 import jwt
 import hashlib
+import inspect
 import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any, Set
+from typing import Optional, List, Dict, Any, FrozenSet, Iterable, Set, Tuple, Union
 from dataclasses import dataclass, field
-from enum import Enum
+from functools import lru_cache, reduce, wraps
+from operator import or_
+from enum import Enum, IntFlag
 import logging
 
+import argon2
+from argon2.exceptions import InvalidHashError, VerificationError
 from passlib.context import CryptContext
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, ConfigDict, field_validator
 
 from core.exceptions import AuthenticationError, AuthorizationError
 
+# Conditional import: orjson is optional and only speeds up token handling
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads  # type: ignore
+except ImportError:
+    import json
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Decode options, built once rather than per verified request. Tokens carry
+# no audience claim, so the audience check is skipped outright.
+_VERIFY_OPTIONS = {"verify_aud": False}
+_REVOKE_OPTIONS = {"verify_aud": False, "verify_exp": False}  # Revoking expired tokens is fine
+
+# Password hashing: argon2 called directly, with passlib kept only to verify
+# legacy bcrypt hashes until they are rehashed on the user's next login
+_ARGON2_PREFIX = "$argon2"
+_LEGACY_PWD_CONTEXT = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# Claims every access token carries; trusted tokens missing any of them
+# go through full validation (and fail there)
+_TOKEN_PAYLOAD_FIELDS = frozenset({"sub", "username", "roles", "permissions", "exp", "iat", "jti"})
+
+_URLSAFE = base64.urlsafe_b64encode
+
+# Verified tokens kept for reuse across requests
+VERIFY_CACHE_MAX_SIZE = 10_000
+
 
 # ============================================================================
 # Models and Enums
 # ============================================================================
 
-class Permission(str, Enum):
-    """System permissions."""
+class Permission(IntFlag):
+    """
+    System permissions.
+
+    Each permission is one bit, so a permission set is a single Permission
+    value and permission checks are integer ANDs.
+    """
     # Agent permissions
-    AGENT_CREATE = "agent:create"
-    AGENT_READ = "agent:read"
-    AGENT_UPDATE = "agent:update"
-    AGENT_DELETE = "agent:delete"
-    AGENT_EXECUTE = "agent:execute"
+    AGENT_CREATE = 1 << 0
+    AGENT_READ = 1 << 1
+    AGENT_UPDATE = 1 << 2
+    AGENT_DELETE = 1 << 3
+    AGENT_EXECUTE = 1 << 4
 
     # Workflow permissions
-    WORKFLOW_CREATE = "workflow:create"
-    WORKFLOW_READ = "workflow:read"
-    WORKFLOW_UPDATE = "workflow:update"
-    WORKFLOW_DELETE = "workflow:delete"
-    WORKFLOW_EXECUTE = "workflow:execute"
-    WORKFLOW_DEPLOY = "workflow:deploy"
+    WORKFLOW_CREATE = 1 << 5
+    WORKFLOW_READ = 1 << 6
+    WORKFLOW_UPDATE = 1 << 7
+    WORKFLOW_DELETE = 1 << 8
+    WORKFLOW_EXECUTE = 1 << 9
+    WORKFLOW_DEPLOY = 1 << 10
 
     # Memory permissions
-    MEMORY_CREATE = "memory:create"
-    MEMORY_READ = "memory:read"
-    MEMORY_UPDATE = "memory:update"
-    MEMORY_DELETE = "memory:delete"
+    MEMORY_CREATE = 1 << 11
+    MEMORY_READ = 1 << 12
+    MEMORY_UPDATE = 1 << 13
+    MEMORY_DELETE = 1 << 14
 
     # System permissions
-    SYSTEM_ADMIN = "system:admin"
-    SYSTEM_CONFIG = "system:config"
-    SYSTEM_METRICS = "system:metrics"
-    SYSTEM_AUDIT = "system:audit"
+    SYSTEM_ADMIN = 1 << 15
+    SYSTEM_CONFIG = 1 << 16
+    SYSTEM_METRICS = 1 << 17
+    SYSTEM_AUDIT = 1 << 18
 
     # User management
-    USER_CREATE = "user:create"
-    USER_READ = "user:read"
-    USER_UPDATE = "user:update"
-    USER_DELETE = "user:delete"
+    USER_CREATE = 1 << 19
+    USER_READ = 1 << 20
+    USER_UPDATE = 1 << 21
+    USER_DELETE = 1 << 22
+
+    @property
+    def scope(self) -> str:
+        """The permission's "resource:action" name (e.g. "agent:create")."""
+        return self.name.lower().replace("_", ":", 1)
 
 
 class Role(str, Enum):
@@ -70,7 +124,7 @@ class Role(str, Enum):
     GUEST = "guest"
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """User model."""
     user_id: str
@@ -78,30 +132,100 @@ class User:
     email: str
     hashed_password: str
     roles: Set[Role] = field(default_factory=set)
-    permissions: Set[Permission] = field(default_factory=set)
+    permissions: Permission = Permission(0)
+    is_admin: bool = False  # Role.ADMIN in roles, kept in sync by RBACManager
     metadata: Dict[str, Any] = field(default_factory=dict)
     is_active: bool = True
     created_at: datetime = field(default_factory=datetime.utcnow)
     last_login: Optional[datetime] = None
+    # Role values as serialized into tokens; rebuilt lazily after role changes
+    _role_values: Optional[Tuple[str, ...]] = field(default=None, init=False, repr=False, compare=False)
+
+    def token_role_values(self) -> Tuple[str, ...]:
+        """Role values for token payloads, cached until the roles change."""
+        if self._role_values is None:
+            self._role_values = tuple(role.value for role in self.roles)
+        return self._role_values
 
 
 class TokenPayload(BaseModel):
     """JWT token payload."""
+    model_config = ConfigDict(frozen=True)
+
     sub: str  # Subject (user_id)
     username: str
     roles: List[str]
-    permissions: List[str]
+    permissions: int  # Permission bitmask
     exp: int  # Expiration timestamp
     iat: int  # Issued at timestamp
     jti: str  # JWT ID (unique token identifier)
 
-    @validator('exp')
+    @field_validator('exp')
+    @classmethod
     def check_expiration(cls, v):
-        if v < int(datetime.utcnow().timestamp()):
+        if v < int(time.time()):
             raise ValueError("Token has expired")
         return v
 
 
+class RevokedTokens:
+    """
+    Revoked token IDs, each kept only until its token would have expired.
+
+    A revoked token stops mattering once its exp passes (verification
+    rejects it anyway), so entries are swept out instead of accumulating
+    for the life of the process.
+    """
+
+    SWEEP_INTERVAL = 60.0  # seconds
+
+    def __init__(self):
+        self._expiry: Dict[str, float] = {}  # jti -> exp (POSIX seconds)
+        self._next_sweep = time.time() + self.SWEEP_INTERVAL
+        self._lock = threading.Lock()
+
+    def add(self, jti: str, exp: Optional[float] = None):
+        """Revoke a token ID until exp (forever if the token has no exp)."""
+        now = time.time()
+        with self._lock:
+            self._expiry[jti] = float("inf") if exp is None else exp
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+    def __contains__(self, jti: object) -> bool:
+        return jti in self._expiry
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def _sweep(self, now: float):
+        """Drop entries whose tokens have expired. Caller holds the lock."""
+        self._expiry = {jti: exp for jti, exp in self._expiry.items() if exp > now}
+        self._next_sweep = now + self.SWEEP_INTERVAL
+
+
+def _as_permission(permissions: Union[Permission, Iterable[Permission]]) -> Permission:
+    """Combine an iterable of permissions into one flag (flags pass through)."""
+    if isinstance(permissions, Permission):
+        return permissions
+    return reduce(or_, permissions, Permission(0))
+
+
+def _new_jti() -> str:
+    """Random 96-bit token ID, base64url encoded (16 chars)."""
+    return _URLSAFE(secrets.token_bytes(12)).decode()
+
+
+def _b64url_encode(data: bytes) -> bytes:
+    """Encode bytes as an unpadded base64url JWT segment."""
+    return _URLSAFE(data).rstrip(b"=")
+
+
+def _b64url_decode(segment: str) -> bytes:
+    """Decode an unpadded base64url JWT segment."""
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
 # ============================================================================
 # RBAC Manager
 # ============================================================================
@@ -121,55 +245,53 @@ class RBACManager:
 
     # Role permission mappings
     ROLE_PERMISSIONS = {
-        Role.ADMIN: {
+        Role.ADMIN: (
             # Full system access
-            Permission.AGENT_CREATE, Permission.AGENT_READ, Permission.AGENT_UPDATE,
-            Permission.AGENT_DELETE, Permission.AGENT_EXECUTE,
-            Permission.WORKFLOW_CREATE, Permission.WORKFLOW_READ, Permission.WORKFLOW_UPDATE,
-            Permission.WORKFLOW_DELETE, Permission.WORKFLOW_EXECUTE, Permission.WORKFLOW_DEPLOY,
-            Permission.MEMORY_CREATE, Permission.MEMORY_READ, Permission.MEMORY_UPDATE,
-            Permission.MEMORY_DELETE,
-            Permission.SYSTEM_ADMIN, Permission.SYSTEM_CONFIG, Permission.SYSTEM_METRICS,
-            Permission.SYSTEM_AUDIT,
-            Permission.USER_CREATE, Permission.USER_READ, Permission.USER_UPDATE,
-            Permission.USER_DELETE,
-        },
-        Role.DEVELOPER: {
+            Permission.AGENT_CREATE | Permission.AGENT_READ | Permission.AGENT_UPDATE |
+            Permission.AGENT_DELETE | Permission.AGENT_EXECUTE | Permission.WORKFLOW_CREATE |
+            Permission.WORKFLOW_READ | Permission.WORKFLOW_UPDATE |
+            Permission.WORKFLOW_DELETE | Permission.WORKFLOW_EXECUTE |
+            Permission.WORKFLOW_DEPLOY | Permission.MEMORY_CREATE | Permission.MEMORY_READ |
+            Permission.MEMORY_UPDATE | Permission.MEMORY_DELETE | Permission.SYSTEM_ADMIN |
+            Permission.SYSTEM_CONFIG | Permission.SYSTEM_METRICS | Permission.SYSTEM_AUDIT |
+            Permission.USER_CREATE | Permission.USER_READ | Permission.USER_UPDATE |
+            Permission.USER_DELETE
+        ),
+        Role.DEVELOPER: (
             # Development and deployment
-            Permission.AGENT_CREATE, Permission.AGENT_READ, Permission.AGENT_UPDATE,
-            Permission.AGENT_EXECUTE,
-            Permission.WORKFLOW_CREATE, Permission.WORKFLOW_READ, Permission.WORKFLOW_UPDATE,
-            Permission.WORKFLOW_EXECUTE, Permission.WORKFLOW_DEPLOY,
-            Permission.MEMORY_CREATE, Permission.MEMORY_READ, Permission.MEMORY_UPDATE,
-            Permission.SYSTEM_METRICS,
-        },
-        Role.ANALYST: {
+            Permission.AGENT_CREATE | Permission.AGENT_READ | Permission.AGENT_UPDATE |
+            Permission.AGENT_EXECUTE | Permission.WORKFLOW_CREATE | Permission.WORKFLOW_READ |
+            Permission.WORKFLOW_UPDATE | Permission.WORKFLOW_EXECUTE |
+            Permission.WORKFLOW_DEPLOY | Permission.MEMORY_CREATE | Permission.MEMORY_READ |
+            Permission.MEMORY_UPDATE | Permission.SYSTEM_METRICS
+        ),
+        Role.ANALYST: (
             # Read and analysis
-            Permission.AGENT_READ, Permission.AGENT_EXECUTE,
-            Permission.WORKFLOW_READ, Permission.WORKFLOW_EXECUTE,
-            Permission.MEMORY_READ,
-            Permission.SYSTEM_METRICS,
-        },
-        Role.OPERATOR: {
+            Permission.AGENT_READ | Permission.AGENT_EXECUTE | Permission.WORKFLOW_READ |
+            Permission.WORKFLOW_EXECUTE | Permission.MEMORY_READ | Permission.SYSTEM_METRICS
+        ),
+        Role.OPERATOR: (
             # Execute and monitor
-            Permission.AGENT_READ, Permission.AGENT_EXECUTE,
-            Permission.WORKFLOW_READ, Permission.WORKFLOW_EXECUTE,
-            Permission.MEMORY_READ,
-            Permission.SYSTEM_METRICS,
-        },
-        Role.VIEWER: {
+            Permission.AGENT_READ | Permission.AGENT_EXECUTE | Permission.WORKFLOW_READ |
+            Permission.WORKFLOW_EXECUTE | Permission.MEMORY_READ | Permission.SYSTEM_METRICS
+        ),
+        Role.VIEWER: (
             # Read-only access
-            Permission.AGENT_READ,
-            Permission.WORKFLOW_READ,
-            Permission.MEMORY_READ,
-            Permission.SYSTEM_METRICS,
-        },
-        Role.GUEST: {
+            Permission.AGENT_READ | Permission.WORKFLOW_READ | Permission.MEMORY_READ |
+            Permission.SYSTEM_METRICS
+        ),
+        Role.GUEST: (
             # Minimal access
-            Permission.WORKFLOW_READ,
-        },
+            Permission.WORKFLOW_READ
+        ),
     }
 
+    @classmethod
+    @lru_cache(maxsize=64)
+    def _permissions_for_roles(cls, roles: FrozenSet[Role]) -> Permission:
+        """Union of the permissions granted by a role combination."""
+        return reduce(or_, (cls.ROLE_PERMISSIONS.get(role, Permission(0)) for role in roles), Permission(0))
+
     def __init__(
         self,
         secret_key: Optional[str] = None,
@@ -188,31 +310,68 @@ class RBACManager:
         """
         self.secret_key = secret_key or self._generate_secret_key()
         self.algorithm = algorithm
+        self._algorithms = (algorithm,)
+        self._secret_bytes = self.secret_key.encode()
+        self._header_b64 = _b64url_encode(_json_dumps({"alg": algorithm, "typ": "JWT"}))
         self.access_token_expire_minutes = access_token_expire_minutes
         self.refresh_token_expire_days = refresh_token_expire_days
 
-        # Password hashing context
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        # Password hashing (argon2id, OWASP-recommended parameters); the C
+        # extension releases the GIL, so batch logins can verify in parallel
+        self.ph = argon2.PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+        self._hash_pool = ThreadPoolExecutor(
+            max_workers=min(32, (os.cpu_count() or 4) * 2),
+            thread_name_prefix="rbac-hash"
+        )
 
         # In-memory user store (replace with database in production)
         self.users: Dict[str, User] = {}
+        self.users_by_username: Dict[str, User] = {}
 
         # Revoked tokens (for logout)
-        self.revoked_tokens: Set[str] = set()
+        self.revoked_tokens = RevokedTokens()
+
+        # blake2b(token) -> (verified payload, exp, fully validated), least
+        # recently used first. Only successfully verified tokens are cached;
+        # revocation is still checked on every hit, and strict callers skip
+        # entries the fast path stored without pydantic validation.
+        self._verify_cache: OrderedDict[bytes, Tuple[TokenPayload, int, bool]] = OrderedDict()
+        self._verify_cache_lock = threading.Lock()
 
-        logger.info("RBAC Manager initialized")
+        # (blake2b(token), strict) -> verification running in the hash pool,
+        # shared by concurrent verify_token_async callers
+        self._inflight: Dict[Tuple[bytes, bool], asyncio.Future] = {}
+
+        # Token signing relies on OpenSSL's SHA-256 (which uses the CPU's SHA
+        # extensions where present); a non-OpenSSL build is far slower
+        if hashlib.sha256.__name__ != "openssl_sha256":
+            logger.warning("hashlib.sha256 is not OpenSSL-backed; JWT signing will be slow")
+
+        logger.info(f"RBAC Manager initialized ({ssl.OPENSSL_VERSION})")
 
     def _generate_secret_key(self) -> str:
         """Generate a secure secret key."""
         return secrets.token_urlsafe(32)
 
     def hash_password(self, password: str) -> str:
-        """Hash a password using bcrypt."""
-        return self.pwd_context.hash(password)
+        """Hash a password using argon2."""
+        return self.ph.hash(password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Verify a password against its hash."""
-        return self.pwd_context.verify(plain_password, hashed_password)
+        """Verify a password against its hash (argon2, or legacy bcrypt)."""
+        if not hashed_password.startswith(_ARGON2_PREFIX):
+            return _LEGACY_PWD_CONTEXT.verify(plain_password, hashed_password)
+
+        try:
+            return self.ph.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def password_needs_rehash(self, hashed_password: str) -> bool:
+        """Check if a hash is legacy bcrypt or uses outdated argon2 parameters."""
+        if not hashed_password.startswith(_ARGON2_PREFIX):
+            return True
+        return self.ph.check_needs_rehash(hashed_password)
 
     def create_user(
         self,
@@ -220,7 +379,7 @@ class RBACManager:
         email: str,
         password: str,
         roles: Optional[Set[Role]] = None,
-        additional_permissions: Optional[Set[Permission]] = None
+        additional_permissions: Optional[Union[Permission, Iterable[Permission]]] = None
     ) -> User:
         """
         Create a new user.
@@ -234,27 +393,38 @@ class RBACManager:
 
         Returns:
             Created user
+
+        Raises:
+            ValueError: If the username is already taken
         """
-        user_id = hashlib.sha256(f"{username}{email}{datetime.utcnow()}".encode()).hexdigest()[:16]
+        if username in self.users_by_username:
+            raise ValueError(f"Username already exists: {username}")
+
+        # Random 64-bit ID; retry on the (astronomically unlikely) collision
+        user_id = secrets.token_hex(8)
+        while user_id in self.users:
+            user_id = secrets.token_hex(8)
+
+        user_roles = roles or {Role.VIEWER}
 
         # Calculate effective permissions
-        effective_permissions = set()
-        for role in (roles or {Role.VIEWER}):
-            effective_permissions.update(self.ROLE_PERMISSIONS.get(role, set()))
+        effective_permissions = self._permissions_for_roles(frozenset(user_roles))
 
         if additional_permissions:
-            effective_permissions.update(additional_permissions)
+            effective_permissions = effective_permissions | _as_permission(additional_permissions)
 
         user = User(
             user_id=user_id,
             username=username,
             email=email,
             hashed_password=self.hash_password(password),
-            roles=roles or {Role.VIEWER},
-            permissions=effective_permissions
+            roles=user_roles,
+            permissions=effective_permissions,
+            is_admin=Role.ADMIN in user_roles
         )
 
         self.users[user_id] = user
+        self.users_by_username[username] = user
         logger.info(f"Created user: {username} (ID: {user_id})")
 
         return user
@@ -263,6 +433,9 @@ class RBACManager:
         """
         Authenticate a user.
 
+        Deprecated for async callers: password verification blocks the event
+        loop, use authenticate_user_async instead.
+
         Args:
             username: Username
             password: Plain text password
@@ -270,8 +443,81 @@ class RBACManager:
         Returns:
             User if authentication successful, None otherwise
         """
-        # Find user by username
-        user = next((u for u in self.users.values() if u.username == username), None)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            logger.warning(
+                "authenticate_user called from the event loop; "
+                "use authenticate_user_async to avoid blocking it"
+            )
+
+        user = self._login_candidate(username)
+        if not user:
+            return None
+
+        if not self.verify_password(password, user.hashed_password):
+            logger.warning(f"Authentication failed: invalid password - {username}")
+            return None
+
+        # Migrate legacy or outdated hashes while the plain password is at hand
+        if self.password_needs_rehash(user.hashed_password):
+            user.hashed_password = self.hash_password(password)
+
+        return self._login_succeeded(user)
+
+    async def authenticate_user_async(self, username: str, password: str) -> Optional[User]:
+        """
+        Authenticate a user without blocking the event loop.
+
+        Password hashing runs in the hash thread pool; the hasher releases the
+        GIL, so concurrent logins verify in parallel.
+
+        Args:
+            username: Username
+            password: Plain text password
+
+        Returns:
+            User if authentication successful, None otherwise
+        """
+        user = self._login_candidate(username)
+        if not user:
+            return None
+
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(
+            self._hash_pool, self.verify_password, password, user.hashed_password
+        ):
+            logger.warning(f"Authentication failed: invalid password - {username}")
+            return None
+
+        # Migrate legacy or outdated hashes while the plain password is at hand
+        if self.password_needs_rehash(user.hashed_password):
+            user.hashed_password = await loop.run_in_executor(
+                self._hash_pool, self.hash_password, password
+            )
+
+        return self._login_succeeded(user)
+
+    async def authenticate_many(self, credentials: List[Tuple[str, str]]) -> List[Optional[User]]:
+        """
+        Authenticate a batch of users concurrently.
+
+        Args:
+            credentials: (username, plain text password) pairs
+
+        Returns:
+            User or None for each pair, in the same order
+        """
+        return list(await asyncio.gather(*(
+            self.authenticate_user_async(username, password)
+            for username, password in credentials
+        )))
+
+    def _login_candidate(self, username: str) -> Optional[User]:
+        """Look up an active user by username, logging why a login is refused."""
+        user = self.users_by_username.get(username)
 
         if not user:
             logger.warning(f"Authentication failed: user not found - {username}")
@@ -281,14 +527,13 @@ class RBACManager:
             logger.warning(f"Authentication failed: user inactive - {username}")
             return None
 
-        if not self.verify_password(password, user.hashed_password):
-            logger.warning(f"Authentication failed: invalid password - {username}")
-            return None
+        return user
 
-        # Update last login
+    def _login_succeeded(self, user: User) -> User:
+        """Record a successful login."""
         user.last_login = datetime.utcnow()
 
-        logger.info(f"User authenticated: {username}")
+        logger.info(f"User authenticated: {user.username}")
         return user
 
     def create_access_token(
@@ -306,21 +551,23 @@ class RBACManager:
         Returns:
             JWT token string
         """
-        expire = datetime.utcnow() + (
-            expires_delta or timedelta(minutes=self.access_token_expire_minutes)
-        )
+        now = int(time.time())
+        if expires_delta is None:
+            exp = now + self.access_token_expire_minutes * 60
+        else:
+            exp = now + int(expires_delta.total_seconds())
 
         payload = {
             "sub": user.user_id,
             "username": user.username,
-            "roles": [role.value for role in user.roles],
-            "permissions": [perm.value for perm in user.permissions],
-            "exp": int(expire.timestamp()),
-            "iat": int(datetime.utcnow().timestamp()),
-            "jti": secrets.token_urlsafe(16)  # Unique token ID
+            "roles": user.token_role_values(),
+            "permissions": int(user.permissions),
+            "exp": exp,
+            "iat": now,
+            "jti": _new_jti()  # Unique token ID
         }
 
-        token = jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        token = self._encode_token(payload)
         logger.debug(f"Created access token for user: {user.username}")
 
         return token
@@ -335,28 +582,34 @@ class RBACManager:
         Returns:
             JWT refresh token string
         """
-        expire = datetime.utcnow() + timedelta(days=self.refresh_token_expire_days)
+        now = int(time.time())
 
         payload = {
             "sub": user.user_id,
             "username": user.username,
             "type": "refresh",
-            "exp": int(expire.timestamp()),
-            "iat": int(datetime.utcnow().timestamp()),
-            "jti": secrets.token_urlsafe(16)
+            "exp": now + self.refresh_token_expire_days * 86400,
+            "iat": now,
+            "jti": _new_jti()
         }
 
-        token = jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        token = self._encode_token(payload)
         logger.debug(f"Created refresh token for user: {user.username}")
 
         return token
 
-    def verify_token(self, token: str) -> TokenPayload:
+    def verify_token(self, token: str, strict: bool = False) -> TokenPayload:
         """
         Verify and decode JWT token.
 
+        Tokens this manager signs with HS256 are checked in a single pass
+        (one HMAC, one JSON parse) and their payload is trusted without
+        re-validation; strict=True forces full PyJWT + pydantic validation,
+        e.g. for externally issued tokens.
+
         Args:
             token: JWT token string
+            strict: Always use the fully validated decode path
 
         Returns:
             Decoded token payload
@@ -364,31 +617,143 @@ class RBACManager:
         Raises:
             AuthenticationError: If token is invalid or expired
         """
+        cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        cached = self._verify_cache.get(cache_key)
+        # A strict caller only accepts an entry that was fully validated
+        if cached is not None and (cached[2] or not strict):
+            token_data, exp, _ = cached
+            if exp > time.time():
+                if token_data.jti in self.revoked_tokens:
+                    raise AuthenticationError("Token has been revoked")
+                try:
+                    self._verify_cache.move_to_end(cache_key)
+                except KeyError:  # Evicted by another thread meanwhile
+                    pass
+                return token_data
+            # Expired: drop it and let the full decode report the error
+            self._verify_cache.pop(cache_key, None)
+
         try:
             # Decode token
-            payload = jwt.decode(
-                token,
-                self.secret_key,
-                algorithms=[self.algorithm]
-            )
+            fast = not strict and self.algorithm == "HS256"
+            if fast:
+                payload = self._decode_hs256(token)
+            else:
+                payload = self._decode_token(token, _VERIFY_OPTIONS)
 
             # Check if token is revoked
             jti = payload.get("jti")
             if jti in self.revoked_tokens:
                 raise AuthenticationError("Token has been revoked")
 
-            # Validate payload structure
-            token_data = TokenPayload(**payload)
-
-            return token_data
+            # Validate payload structure; a signature we produced vouches for
+            # the claim types, so only their presence is checked
+            validated = not (fast and payload.keys() >= _TOKEN_PAYLOAD_FIELDS)
+            if validated:
+                token_data = TokenPayload(**payload)
+            else:
+                token_data = TokenPayload.model_construct(**payload)
 
         except jwt.ExpiredSignatureError:
             raise AuthenticationError("Token has expired")
-        except jwt.JWTError as e:
+        except jwt.PyJWTError as e:
             raise AuthenticationError(f"Invalid token: {str(e)}")
         except Exception as e:
             raise AuthenticationError(f"Token verification failed: {str(e)}")
 
+        with self._verify_cache_lock:
+            self._verify_cache[cache_key] = (token_data, token_data.exp, validated)
+            if len(self._verify_cache) > VERIFY_CACHE_MAX_SIZE:
+                self._verify_cache.popitem(last=False)
+
+        return token_data
+
+    async def verify_token_async(self, token: str, strict: bool = False) -> TokenPayload:
+        """
+        Verify and decode a JWT token without blocking the event loop.
+
+        Cache hits are answered inline. Misses are verified in the hash thread
+        pool, and concurrent callers presenting the same token share a single
+        verification.
+
+        Args:
+            token: JWT token string
+            strict: Always use the fully validated decode path
+
+        Returns:
+            Decoded token payload
+
+        Raises:
+            AuthenticationError: If token is invalid or expired
+        """
+        cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        cached = self._verify_cache.get(cache_key)
+        if cached is not None and cached[1] > time.time() and (cached[2] or not strict):
+            return self.verify_token(token, strict)
+
+        loop = asyncio.get_running_loop()
+        flight_key = (cache_key, strict)
+        future = self._inflight.get(flight_key)
+        if future is None or future.get_loop() is not loop:
+            future = loop.run_in_executor(self._hash_pool, self.verify_token, token, strict)
+            self._inflight[flight_key] = future
+
+            def _land(done: asyncio.Future) -> None:
+                if self._inflight.get(flight_key) is done:
+                    del self._inflight[flight_key]
+
+            future.add_done_callback(_land)
+
+        # Shielded so one cancelled caller does not cancel the shared flight
+        return await asyncio.shield(future)
+
+    def _encode_token(self, payload: Dict[str, Any]) -> str:
+        """Sign a payload; HS256 is serialized directly with the precomputed header."""
+        if self.algorithm != "HS256":
+            return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+
+        signing_input = self._header_b64 + b"." + _b64url_encode(_json_dumps(payload))
+        signature = hmac.digest(self._secret_bytes, signing_input, "sha256")
+        return (signing_input + b"." + _b64url_encode(signature)).decode()
+
+    def _decode_hs256(self, token: str) -> Dict[str, Any]:
+        """
+        Verify an HS256 token's signature and expiry and decode its payload.
+
+        Raises the same PyJWT exceptions as jwt.decode.
+        """
+        if token.count(".") != 2:
+            raise jwt.DecodeError("Not enough segments")
+
+        signing_input, _, signature_b64 = token.rpartition(".")
+        header_b64, _, payload_b64 = signing_input.partition(".")
+
+        try:
+            header = _json_loads(_b64url_decode(header_b64))
+            payload = _json_loads(_b64url_decode(payload_b64))
+            signature = _b64url_decode(signature_b64)
+        except (ValueError, binascii.Error) as e:
+            raise jwt.DecodeError(f"Invalid token encoding: {e}")
+
+        if not isinstance(header, dict) or header.get("alg") != "HS256":
+            raise jwt.InvalidAlgorithmError("The specified alg value is not allowed")
+        if not isinstance(payload, dict):
+            raise jwt.DecodeError("Invalid payload string: must be a json object")
+
+        expected = hmac.digest(self._secret_bytes, signing_input.encode(), "sha256")
+        if not hmac.compare_digest(expected, signature):
+            raise jwt.InvalidSignatureError("Signature verification failed")
+
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)) and exp <= time.time():
+            raise jwt.ExpiredSignatureError("Signature has expired")
+
+        return payload
+
+    def _decode_token(self, token: str, options: Dict[str, bool]) -> Dict[str, Any]:
+        """Verify a token's signature with the configured algorithm and decode it."""
+        return jwt.decode(token, self.secret_key, algorithms=self._algorithms, options=options)
+
     def revoke_token(self, token: str):
         """
         Revoke a token (logout).
@@ -397,17 +762,12 @@ class RBACManager:
             token: JWT token string
         """
         try:
-            payload = jwt.decode(
-                token,
-                self.secret_key,
-                algorithms=[self.algorithm],
-                options={"verify_exp": False}  # Don't verify expiration for revocation
-            )
+            payload = self._decode_token(token, _REVOKE_OPTIONS)
             jti = payload.get("jti")
             if jti:
-                self.revoked_tokens.add(jti)
+                self.revoked_tokens.add(jti, payload.get("exp"))
                 logger.info(f"Token revoked: {jti}")
-        except jwt.JWTError as e:
+        except jwt.PyJWTError as e:
             logger.warning(f"Failed to revoke token: {e}")
 
     def check_permission(
@@ -426,15 +786,15 @@ class RBACManager:
             True if user has permission
         """
         # Admins have all permissions
-        if Role.ADMIN in user.roles:
+        if user.is_admin:
             return True
 
-        return required_permission in user.permissions
+        return bool(user.permissions & required_permission)
 
     def check_permissions(
         self,
         user: User,
-        required_permissions: Set[Permission],
+        required_permissions: Union[Permission, Iterable[Permission]],
         require_all: bool = True
     ) -> bool:
         """
@@ -442,7 +802,7 @@ class RBACManager:
 
         Args:
             user: User object
-            required_permissions: Set of required permissions
+            required_permissions: Required permissions (combined flag or iterable)
             require_all: If True, user must have all permissions.
                         If False, user must have at least one.
 
@@ -450,13 +810,14 @@ class RBACManager:
             True if permission check passes
         """
         # Admins have all permissions
-        if Role.ADMIN in user.roles:
+        if user.is_admin:
             return True
 
+        required = _as_permission(required_permissions)
         if require_all:
-            return required_permissions.issubset(user.permissions)
+            return (user.permissions & required) == required
         else:
-            return bool(required_permissions.intersection(user.permissions))
+            return bool(user.permissions & required)
 
     def get_user_by_id(self, user_id: str) -> Optional[User]:
         """Get user by ID."""
@@ -481,13 +842,11 @@ class RBACManager:
             raise ValueError(f"User not found: {user_id}")
 
         user.roles = new_roles
+        user.is_admin = Role.ADMIN in new_roles
+        user._role_values = None
 
         # Recalculate permissions
-        effective_permissions = set()
-        for role in new_roles:
-            effective_permissions.update(self.ROLE_PERMISSIONS.get(role, set()))
-
-        user.permissions = effective_permissions
+        user.permissions = self._permissions_for_roles(frozenset(new_roles))
 
         logger.info(f"Updated roles for user {user.username}: {[r.value for r in new_roles]}")
 
@@ -499,8 +858,8 @@ class RBACManager:
         if not user:
             raise ValueError(f"User not found: {user_id}")
 
-        user.permissions.add(permission)
-        logger.info(f"Added permission {permission.value} to user {user.username}")
+        user.permissions |= permission
+        logger.info(f"Added permission {permission.scope} to user {user.username}")
 
         return user
 
@@ -510,8 +869,8 @@ class RBACManager:
         if not user:
             raise ValueError(f"User not found: {user_id}")
 
-        user.permissions.discard(permission)
-        logger.info(f"Removed permission {permission.value} from user {user.username}")
+        user.permissions &= ~permission
+        logger.info(f"Removed permission {permission.scope} from user {user.username}")
 
         return user
 
@@ -520,25 +879,53 @@ class RBACManager:
 # Decorators
 # ============================================================================
 
-def require_permission(permission: Permission):
+def require_permission(*permissions: Permission, require_all: bool = True):
     """
-    Decorator to require a specific permission.
+    Decorator to require one or more permissions.
+
+    Works on both sync and async functions. The permissions are combined into
+    a single mask at decoration time, so each call is one admin test and one
+    integer AND.
+
+    Args:
+        permissions: Required permissions
+        require_all: If True, user must have all permissions.
+                    If False, user must have at least one.
 
     Example:
         @require_permission(Permission.WORKFLOW_EXECUTE)
         async def execute_workflow(user: User, workflow_id: str):
             ...
     """
+    if not permissions:
+        raise ValueError("require_permission needs at least one permission")
+
+    mask = _as_permission(permissions)
+    action = ",".join(perm.scope for perm in permissions)
+
     def decorator(func):
-        async def wrapper(*args, user: User, **kwargs):
-            rbac = get_global_rbac()
-            if not rbac.check_permission(user, permission):
+        def check(user: User) -> None:
+            if user.is_admin:
+                return
+            granted = user.permissions & mask
+            if (granted != mask) if require_all else not granted:
                 raise AuthorizationError(
                     user_id=user.user_id,
                     resource=func.__name__,
-                    action=permission.value
+                    action=action
                 )
-            return await func(*args, user=user, **kwargs)
+
+        # Sync functions get a plain wrapper, so no coroutine is created
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, user: User, **kwargs):
+                check(user)
+                return await func(*args, user=user, **kwargs)
+        else:
+            @wraps(func)
+            def wrapper(*args, user: User, **kwargs):
+                check(user)
+                return func(*args, user=user, **kwargs)
         return wrapper
     return decorator
 
@@ -547,20 +934,34 @@ def require_role(role: Role):
     """
     Decorator to require a specific role.
 
+    Works on both sync and async functions.
+
     Example:
         @require_role(Role.ADMIN)
         async def admin_function(user: User):
             ...
     """
+    action = f"role:{role.value}"
+
     def decorator(func):
-        async def wrapper(*args, user: User, **kwargs):
+        def check(user: User) -> None:
             if role not in user.roles:
                 raise AuthorizationError(
                     user_id=user.user_id,
                     resource=func.__name__,
-                    action=f"role:{role.value}"
+                    action=action
                 )
-            return await func(*args, user=user, **kwargs)
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, user: User, **kwargs):
+                check(user)
+                return await func(*args, user=user, **kwargs)
+        else:
+            @wraps(func)
+            def wrapper(*args, user: User, **kwargs):
+                check(user)
+                return func(*args, user=user, **kwargs)
         return wrapper
     return decorator
 
@@ -5,7 +5,9 @@ Provides secure storage and retrieval of credentials, API keys, and sensitive da
 import os
 import json
 import logging
-from typing import Optional, Dict, Any
+import time
+import shutil
+from typing import Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 
 import hvac
@@ -14,6 +16,21 @@ import base64
 
 from core.exceptions import ConfigurationException
 
+# Conditional import: orjson is optional.  It serializes straight to bytes
+# and is several times faster; without it the stdlib json module is used.
+try:
+    import orjson  # type: ignore
+
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None  # type: ignore
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,7 +53,8 @@ class VaultSecretsManager:
         vault_role_id: Optional[str] = None,
         vault_secret_id: Optional[str] = None,
         mount_point: str = "secret",
-        kv_version: int = 2
+        kv_version: int = 2,
+        cache_ttl: float = 300.0
     ):
         """
         Initialize Vault secrets manager.
@@ -48,10 +66,15 @@ class VaultSecretsManager:
             vault_secret_id: AppRole secret ID (for AppRole auth)
             mount_point: KV secrets engine mount point
             kv_version: KV secrets engine version (1 or 2)
+            cache_ttl: Seconds to cache a read when Vault reports no lease
         """
         self.vault_url = vault_url
         self.mount_point = mount_point
         self.kv_version = kv_version
+        self.cache_ttl = cache_ttl
+
+        # path -> (monotonic expiry, secret data)
+        self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
 
         # Initialize Vault client
         self.client = hvac.Client(url=vault_url)
@@ -103,26 +126,21 @@ class VaultSecretsManager:
         """
         Retrieve a secret from Vault.
 
+        Reads are cached for the secret's lease_duration (cache_ttl when
+        Vault reports none, as KV v2 does).
+
         Args:
             path: Secret path (e.g., "dell-boca/database")
 
         Returns:
             Secret data dictionary
         """
-        try:
-            if self.kv_version == 2:
-                response = self.client.secrets.kv.v2.read_secret_version(
-                    path=path,
-                    mount_point=self.mount_point
-                )
-                return response['data']['data']
-            else:
-                response = self.client.secrets.kv.v1.read_secret(
-                    path=path,
-                    mount_point=self.mount_point
-                )
-                return response['data']
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] > time.monotonic():
+            return dict(cached[1])
 
+        try:
+            data, lease_duration = self._read_secret(path)
         except hvac.exceptions.InvalidPath:
             logger.error(f"Secret not found: {path}")
             return {}
@@ -130,6 +148,37 @@ class VaultSecretsManager:
             logger.error(f"Failed to retrieve secret {path}: {e}")
             raise
 
+        ttl = lease_duration or self.cache_ttl
+        self._cache[path] = (time.monotonic() + ttl, data)
+        return dict(data)
+
+    def _read_secret(self, path: str) -> Tuple[Dict[str, Any], int]:
+        """Read a secret from Vault, returning (data, lease_duration)."""
+        if self.kv_version == 2:
+            response = self.client.secrets.kv.v2.read_secret_version(
+                path=path,
+                mount_point=self.mount_point
+            )
+            return response['data']['data'], response.get('lease_duration', 0)
+        else:
+            response = self.client.secrets.kv.v1.read_secret(
+                path=path,
+                mount_point=self.mount_point
+            )
+            return response['data'], response.get('lease_duration', 0)
+
+    def invalidate(self, path: Optional[str] = None):
+        """
+        Drop cached reads.
+
+        Args:
+            path: Secret path to drop (all paths if None)
+        """
+        if path is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(path, None)
+
     def set_secret(self, path: str, data: Dict[str, Any]):
         """
         Store a secret in Vault.
@@ -152,6 +201,7 @@ class VaultSecretsManager:
                     mount_point=self.mount_point
                 )
 
+            self.invalidate(path)
             logger.info(f"Secret stored: {path}")
 
         except Exception as e:
@@ -177,18 +227,23 @@ class VaultSecretsManager:
                     mount_point=self.mount_point
                 )
 
+            self.invalidate(path)
             logger.info(f"Secret deleted: {path}")
 
         except Exception as e:
             logger.error(f"Failed to delete secret {path}: {e}")
             raise
 
-    def renew_token(self, increment: Optional[int] = None):
+    def renew_token(self, increment: Optional[int] = None, refresh_within: float = 30.0):
         """
         Renew the Vault token.
 
+        Also re-reads cached secrets that expire within refresh_within
+        seconds, so periodic renewal keeps hot paths off the network.
+
         Args:
             increment: Lease increment in seconds
+            refresh_within: Refresh cached secrets expiring this soon
         """
         try:
             self.client.auth.token.renew_self(increment=increment)
@@ -197,12 +252,31 @@ class VaultSecretsManager:
             logger.error(f"Failed to renew token: {e}")
             raise
 
+        deadline = time.monotonic() + refresh_within
+        for path in [p for p, (expires, _) in self._cache.items() if expires <= deadline]:
+            self.invalidate(path)
+            try:
+                self.get_secret(path)
+            except Exception as e:
+                logger.warning(f"Failed to refresh cached secret {path}: {e}")
+
 
 class LocalSecretsManager:
     """
     Local secrets manager using encrypted file storage.
     Fallback option when Vault is not available.
 
+    The file is an append-only log with one Fernet-encrypted record per
+    line: a ["snapshot", secrets] record followed by ["set", path, data]
+    and ["del", path] records. Each change appends one record; the log is
+    compacted back to a single snapshot once it outgrows it. A legacy
+    file (one encrypted secrets dict) loads as a snapshot.
+
+    A log that cannot be fully read (wrong key, corrupt record) raises
+    ConfigurationException and is never rewritten. The one exception is a
+    torn final write: an unterminated last line that fails to decrypt is
+    dropped. Compactions keep the previous file as <secrets_file>.bak.
+
     WARNING: This is less secure than Vault. Use only for development/testing.
     """
 
@@ -231,41 +305,93 @@ class LocalSecretsManager:
 
         # Load existing secrets
         self.secrets: Dict[str, Dict[str, Any]] = {}
+        self._snapshot_size = 0  # Bytes of the snapshot line opening the log
+        self._log_size = 0       # Bytes of the whole log
         self._load_secrets()
 
         logger.warning("Using local secrets manager (NOT RECOMMENDED FOR PRODUCTION)")
 
     def _load_secrets(self):
-        """Load and decrypt secrets from file."""
+        """Load and decrypt secrets by replaying the log."""
         if not os.path.exists(self.secrets_file):
             return
 
+        with open(self.secrets_file, "rb") as f:
+            log = f.read()
+
+        # Legacy files and torn writes don't end in a newline; either way the
+        # log is rewritten before anything is appended to it
+        terminated = log.endswith(b"\n")
+        lines = log.splitlines()
+
+        for line_no, line in enumerate(lines):
+            try:
+                record = _json_loads(self.fernet.decrypt(line))
+            except Exception as e:
+                if line_no > 0 and line_no == len(lines) - 1 and not terminated:
+                    logger.warning(f"Dropping torn final secrets record {line_no}")
+                    break
+                # Wrong key or corruption: refuse to run on (and later
+                # overwrite) a partial view of the store
+                raise ConfigurationException(
+                    f"Cannot decrypt record {line_no} of {self.secrets_file}: {e!r}",
+                    error_code="SECRETS_UNREADABLE",
+                    details={"secrets_file": self.secrets_file, "record": line_no}
+                ) from e
+
+            if isinstance(record, dict):  # Legacy whole-file format
+                self.secrets = record
+            elif record[0] == "snapshot":
+                self.secrets = record[1]
+            elif record[0] == "set":
+                self.secrets[record[1]] = record[2]
+            elif record[0] == "del":
+                self.secrets.pop(record[1], None)
+
+            self._log_size += len(line) + 1
+            if line_no == 0:
+                self._snapshot_size = len(line) + 1
+
+        logger.info(f"Loaded {len(self.secrets)} secrets from {self.secrets_file}")
+
+        if log and not terminated:
+            self.compact()
+
+    def _append_record(self, record: list):
+        """Encrypt and append one record to the log, compacting if it has grown."""
         try:
-            with open(self.secrets_file, "rb") as f:
-                encrypted_data = f.read()
+            line = self.fernet.encrypt(_json_dumps(record)) + b"\n"
 
-            decrypted_data = self.fernet.decrypt(encrypted_data)
-            self.secrets = json.loads(decrypted_data.decode())
+            with open(self.secrets_file, "ab") as f:
+                f.write(line)
 
-            logger.info(f"Loaded {len(self.secrets)} secrets from {self.secrets_file}")
+            self._log_size += len(line)
+            if self._log_size > 2 * max(self._snapshot_size, 4096):
+                self.compact()
 
         except Exception as e:
-            logger.error(f"Failed to load secrets: {e}")
-            self.secrets = {}
+            logger.error(f"Failed to save secrets: {e}")
 
-    def _save_secrets(self):
-        """Encrypt and save secrets to file."""
+    def compact(self):
+        """Atomically rewrite the log as a single snapshot record."""
         try:
-            data = json.dumps(self.secrets).encode()
-            encrypted_data = self.fernet.encrypt(data)
+            line = self.fernet.encrypt(_json_dumps(["snapshot", self.secrets])) + b"\n"
 
-            with open(self.secrets_file, "wb") as f:
-                f.write(encrypted_data)
+            tmp_file = f"{self.secrets_file}.tmp"
+            with open(tmp_file, "wb") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
 
-            logger.debug(f"Saved {len(self.secrets)} secrets to {self.secrets_file}")
+            if os.path.exists(self.secrets_file):
+                shutil.copy2(self.secrets_file, f"{self.secrets_file}.bak")
+            os.replace(tmp_file, self.secrets_file)
+
+            self._snapshot_size = self._log_size = len(line)
+            logger.debug(f"Compacted {len(self.secrets)} secrets into {self.secrets_file}")
 
         except Exception as e:
-            logger.error(f"Failed to save secrets: {e}")
+            logger.error(f"Failed to compact secrets: {e}")
 
     def get_secret(self, path: str) -> Dict[str, Any]:
         """Retrieve a secret."""
@@ -274,14 +400,14 @@ class LocalSecretsManager:
     def set_secret(self, path: str, data: Dict[str, Any]):
         """Store a secret."""
         self.secrets[path] = data
-        self._save_secrets()
+        self._append_record(["set", path, data])
         logger.info(f"Secret stored: {path}")
 
     def delete_secret(self, path: str):
         """Delete a secret."""
         if path in self.secrets:
             del self.secrets[path]
-            self._save_secrets()
+            self._append_record(["del", path])
             logger.info(f"Secret deleted: {path}")
 
 
@@ -3,46 +3,258 @@ Production-grade Celery distributed task queue for Dell Boca Boys V2.
 Provides async task execution, scheduling, and workflow orchestration.
 """
 import os
+import sys
 import logging
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
-from datetime import timedelta
+from datetime import date, datetime, time as dt_time, timedelta
+from decimal import Decimal
+from uuid import UUID
 from celery import Celery, Task, group, chain, chord
 from celery.schedules import crontab
+from celery.signals import worker_process_init
 from kombu import Exchange, Queue
+from kombu.serialization import register as register_serializer
+from kombu.utils.json import (
+    JSONEncoder as _KombuJSONEncoder,
+    dumps as _kombu_json_dumps,
+    loads as _kombu_json_loads,
+    object_hook as _kombu_object_hook,
+)
+
+# Conditional imports: msgpack, orjson and zstandard are optional; without
+# them the serializers below fall back to kombu's JSON and zlib
+try:
+    import msgpack  # type: ignore
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard  # type: ignore
+except ImportError:
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
+# Queues whose tasks are short enough that workers may prefetch ahead
+SHORT_TASK_QUEUES = frozenset({'default'})
+SHORT_TASK_PREFETCH_MULTIPLIER = 4
+
+# Per-task success records are opt-in; failures and retries are always logged
+LOG_TASK_SUCCESS = os.getenv('LOG_TASK_SUCCESS', '0') == '1'
+
 
 # ============================================================================
 # Celery Application Configuration
 # ============================================================================
 
-# Initialize Celery app
+# Initialize Celery app. The broker and backend only need the Redis wire
+# protocol, so a multi-threaded drop-in such as DragonflyDB can be used by
+# pointing CELERY_BROKER_URL / CELERY_RESULT_BACKEND at it
 celery_app = Celery(
     'dell_boca_boys',
     broker=os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0'),
     backend=os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:6379/1')
 )
 
+# ----------------------------------------------------------------------------
+# Message serialization
+# ----------------------------------------------------------------------------
+
+# Bodies below this size are sent as-is; compression only pays off for large
+# payloads such as workflow JSON, LLM batches and their results
+COMPRESS_MIN_BYTES = 4096
+
+# zstd is only sent when every worker has zstandard installed, so it is
+# opt-in; zlib is always available and is the default
+MESSAGE_COMPRESSION = os.getenv('CELERY_MESSAGE_COMPRESSION', 'zlib')
+if MESSAGE_COMPRESSION == 'zstd' and zstandard is None:
+    logger.warning("CELERY_MESSAGE_COMPRESSION=zstd but zstandard is not installed; using zlib")
+    MESSAGE_COMPRESSION = 'zlib'
+
+# First byte of every body names its codec, so any worker can decode it
+_CODEC_RAW = b"\x00"
+_CODEC_ZLIB = b"\x01"
+_CODEC_ZSTD = b"\x02"
+
+
+def _compress(body: bytes) -> bytes:
+    """Prefix a body with its codec, compressing it if it is large."""
+    if len(body) < COMPRESS_MIN_BYTES:
+        return _CODEC_RAW + body
+    if MESSAGE_COMPRESSION == 'zstd':
+        return _CODEC_ZSTD + zstandard.ZstdCompressor(level=3).compress(body)
+    return _CODEC_ZLIB + zlib.compress(body, 6)
+
+
+def _decompress(data: bytes) -> bytes:
+    """Inverse of _compress."""
+    codec, body = data[:1], data[1:]
+    if codec == _CODEC_RAW:
+        return body
+    if codec == _CODEC_ZLIB:
+        return zlib.decompress(body)
+    if codec == _CODEC_ZSTD:
+        if zstandard is None:
+            raise ValueError("Message is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(body)
+    raise ValueError(f"Unknown message codec: {codec!r}")
+
+
+# jsonz bodies decode to the same values as kombu's json: datetimes,
+# Decimals and bytes travel in kombu's {"__type__", "__value__"} envelope and
+# non-string dict keys are stringified. orjson writes UUIDs natively, so
+# they arrive as their canonical string
+_kombu_json_default = _KombuJSONEncoder().default
+
+
+def _revive_json_types(obj: Any) -> Any:
+    """Apply kombu's object_hook bottom-up, as json.loads would."""
+    if isinstance(obj, dict):
+        return _kombu_object_hook({key: _revive_json_types(value) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return [_revive_json_types(value) for value in obj]
+    return obj
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_kombu_json_default, option=_ORJSON_OPTIONS)
+
+    def _json_loads(data: bytes) -> Any:
+        obj = orjson.loads(data)
+        if b'"__type__"' in data:
+            obj = _revive_json_types(obj)
+        return obj
+else:
+    def _json_dumps(obj: Any) -> bytes:
+        return _kombu_json_dumps(obj).encode()
+
+    _json_loads = _kombu_json_loads
+
+
+register_serializer(
+    'jsonz',
+    lambda obj: _compress(_json_dumps(obj)),
+    lambda data: _json_loads(_decompress(data)),
+    content_type='application/x-dellboca-jsonz',
+    content_encoding='binary'
+)
+
+# MessagePack is smaller and faster than JSON for the dict-shaped task
+# arguments and results, but only workers with msgpack installed can read it,
+# so it is opt-in (CELERY_MESSAGE_SERIALIZER=msgpackz) once the whole fleet
+# has it. Types msgpack has no encoding for travel as extension types
+_MSGPACK_EXT_DATETIME = 1
+_MSGPACK_EXT_DATE = 2
+_MSGPACK_EXT_TIME = 3
+_MSGPACK_EXT_DECIMAL = 4
+_MSGPACK_EXT_UUID = 5
+
+
+def _msgpack_default(obj: Any) -> Any:
+    """Encode datetime, date, time, Decimal and UUID as msgpack ExtTypes."""
+    # datetime before date: every datetime is also a date
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(_MSGPACK_EXT_DATETIME, obj.isoformat().encode())
+    if isinstance(obj, date):
+        return msgpack.ExtType(_MSGPACK_EXT_DATE, obj.isoformat().encode())
+    if isinstance(obj, dt_time):
+        return msgpack.ExtType(_MSGPACK_EXT_TIME, obj.isoformat().encode())
+    if isinstance(obj, Decimal):
+        return msgpack.ExtType(_MSGPACK_EXT_DECIMAL, str(obj).encode())
+    if isinstance(obj, UUID):
+        return msgpack.ExtType(_MSGPACK_EXT_UUID, obj.bytes)
+    raise TypeError(f"Object of type {type(obj).__name__} is not msgpack serializable")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    """Inverse of _msgpack_default."""
+    if code == _MSGPACK_EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == _MSGPACK_EXT_DATE:
+        return date.fromisoformat(data.decode())
+    if code == _MSGPACK_EXT_TIME:
+        return dt_time.fromisoformat(data.decode())
+    if code == _MSGPACK_EXT_DECIMAL:
+        return Decimal(data.decode())
+    if code == _MSGPACK_EXT_UUID:
+        return UUID(bytes=data)
+    return msgpack.ExtType(code, data)
+
+
+def _msgpack_dumps(obj: Any) -> bytes:
+    return msgpack.packb(obj, use_bin_type=True, default=_msgpack_default)
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    # Task payloads may carry int-keyed dicts
+    return msgpack.unpackb(data, raw=False, strict_map_key=False, ext_hook=_msgpack_ext_hook)
+
+
+MESSAGE_SERIALIZER = os.getenv('CELERY_MESSAGE_SERIALIZER', 'jsonz')
+ACCEPTED_SERIALIZERS = ['jsonz', 'json']
+
+if msgpack is not None:
+    register_serializer(
+        'msgpackz',
+        lambda obj: _compress(_msgpack_dumps(obj)),
+        lambda data: _msgpack_loads(_decompress(data)),
+        content_type='application/x-dellboca-msgpackz',
+        content_encoding='binary'
+    )
+    ACCEPTED_SERIALIZERS.insert(0, 'msgpackz')
+elif MESSAGE_SERIALIZER == 'msgpackz':
+    logger.warning("CELERY_MESSAGE_SERIALIZER=msgpackz but msgpack is not installed; using jsonz")
+    MESSAGE_SERIALIZER = 'jsonz'
+
+
 # Celery configuration
 celery_app.conf.update(
     # Result backend settings
     result_backend=os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:6379/1'),
     result_expires=3600,  # Results expire after 1 hour
-    result_serializer='json',
-    result_compression='gzip',
+    result_backend_transport_options={
+        'global_keyprefix': os.getenv('CELERY_KEY_PREFIX', 'dell_boca:'),
+    },
+    redis_socket_keepalive=True,
+    redis_backend_health_check_interval=30,
+
+    # Broker connection; list-based queues work unchanged on Redis and
+    # DragonflyDB
+    broker_transport_options={
+        'global_keyprefix': os.getenv('CELERY_KEY_PREFIX', 'dell_boca:'),
+        'socket_keepalive': True,
+        'health_check_interval': 30,
+    },
+    result_serializer=MESSAGE_SERIALIZER,
 
-    # Task settings
-    task_serializer='json',
-    task_compression='gzip',
+    # Task settings; the serializers compress large bodies themselves, so
+    # Celery's whole-message gzip is not used
+    task_serializer=MESSAGE_SERIALIZER,
+    accept_content=ACCEPTED_SERIALIZERS,
+    result_accept_content=ACCEPTED_SERIALIZERS,
     task_track_started=True,
+    task_ignore_result=True,  # Tasks whose callers read results opt back in
     task_time_limit=3600,  # 1 hour hard limit
     task_soft_time_limit=3000,  # 50 minute soft limit
-    task_acks_late=True,  # Acknowledge task after completion
+    # Tasks are acknowledged on receipt; long idempotent tasks opt into
+    # acks_late so a lost worker's task is redelivered
     task_reject_on_worker_lost=True,
 
-    # Worker settings
-    worker_prefetch_multiplier=4,
+    # Worker settings; agent, workflow and LLM tasks are long and IO-bound,
+    # so a worker reserves only the task it is running (see start_worker for
+    # the short-task override)
+    worker_prefetch_multiplier=1,
+    worker_enable_prefetch_count_reduction=True,
     worker_max_tasks_per_child=1000,  # Restart worker after 1000 tasks
     worker_disable_rate_limits=False,
 
@@ -58,6 +270,9 @@ celery_app.conf.update(
         Queue('workflow_tasks', Exchange('dell_boca'), routing_key='workflow.*'),
         Queue('llm_tasks', Exchange('dell_boca'), routing_key='llm.*'),
         Queue('memory_tasks', Exchange('dell_boca'), routing_key='memory.*'),
+        # Beat-scheduled tasks, kept off 'default' so a long metrics run
+        # cannot hold up short ad-hoc jobs
+        Queue('periodic', Exchange('dell_boca'), routing_key='periodic.*'),
         Queue('priority_high', Exchange('dell_boca'), routing_key='priority.high'),
         Queue('priority_low', Exchange('dell_boca'), routing_key='priority.low'),
     ),
@@ -66,9 +281,10 @@ celery_app.conf.update(
     timezone='UTC',
     enable_utc=True,
 
-    # Monitoring
-    worker_send_task_events=True,
-    task_send_sent_event=True,
+    # Monitoring; task events cost several broker writes per task, so they
+    # are only sent when a monitor (e.g. Flower) asks for them
+    worker_send_task_events=os.getenv('CELERY_EVENTS', '0') == '1',
+    task_send_sent_event=os.getenv('CELERY_EVENTS', '0') == '1',
 
     # Beat schedule (periodic tasks)
     beat_schedule={
@@ -76,10 +292,8 @@ celery_app.conf.update(
             'task': 'core.tasks.health_check_all_agents',
             'schedule': crontab(minute='*/5'),  # Every 5 minutes
         },
-        'cleanup-expired-memory': {
-            'task': 'core.tasks.cleanup_expired_memory',
-            'schedule': crontab(hour='*/6'),  # Every 6 hours
-        },
+        # No expired-memory sweep: Redis-cached memory is written with a TTL
+        # (RedisCache.set uses SETEX) and expires server-side
         'update-collective-intelligence': {
             'task': 'core.tasks.update_collective_intelligence',
             'schedule': crontab(minute='*/10'),  # Every 10 minutes
@@ -92,6 +306,16 @@ celery_app.conf.update(
 )
 
 
+@worker_process_init.connect
+def _reset_db_pool(**kwargs):
+    """Prefork children must not share the parent's database connections."""
+    # Only a parent that imported the repository can have opened a pool;
+    # importing it here would load SQLAlchemy into every child
+    workflow_repository = sys.modules.get('core.workflow_repository')
+    if workflow_repository is not None:
+        workflow_repository.reset_pool_after_fork()
+
+
 # ============================================================================
 # Base Task Class
 # ============================================================================
@@ -100,16 +324,17 @@ class DellBocaTask(Task):
     """Base task class with error handling and logging."""
 
     def on_success(self, retval, task_id, args, kwargs):
-        """Called on task success."""
-        logger.info(f"Task {self.name} [{task_id}] succeeded")
+        """Called on task success (logged only with LOG_TASK_SUCCESS=1)."""
+        if LOG_TASK_SUCCESS and logger.isEnabledFor(logging.INFO):
+            logger.info("Task %s [%s] succeeded", self.name, task_id, extra={'task_id': task_id})
 
     def on_failure(self, exc, task_id, args, kwargs, einfo):
         """Called on task failure."""
-        logger.error(f"Task {self.name} [{task_id}] failed: {exc}")
+        logger.error("Task %s [%s] failed: %s", self.name, task_id, exc, extra={'task_id': task_id})
 
     def on_retry(self, exc, task_id, args, kwargs, einfo):
         """Called on task retry."""
-        logger.warning(f"Task {self.name} [{task_id}] retrying: {exc}")
+        logger.warning("Task %s [%s] retrying: %s", self.name, task_id, exc, extra={'task_id': task_id})
 
 
 # ============================================================================
@@ -120,6 +345,7 @@ class DellBocaTask(Task):
     base=DellBocaTask,
     name='core.tasks.execute_agent_task',
     bind=True,
+    ignore_result=False,
     autoretry_for=(Exception,),
     retry_backoff=True,
     retry_kwargs={'max_retries': 3},
@@ -139,7 +365,7 @@ def execute_agent_task(self, agent_id: str, task_data: Dict[str, Any]) -> Dict[s
     """
     from core.intelligence.agent_manager import AgentManager
 
-    logger.info(f"Executing agent task: {agent_id} - {task_data.get('task_type')}")
+    logger.info("Executing agent task: %s - %s", agent_id, task_data.get('task_type'))
 
     # This would integrate with the actual agent manager
     # For now, return a placeholder
@@ -154,8 +380,8 @@ def execute_agent_task(self, agent_id: str, task_data: Dict[str, Any]) -> Dict[s
 @celery_app.task(
     base=DellBocaTask,
     name='core.tasks.health_check_all_agents',
-    queue='agent_tasks',
-    routing_key='agent.health'
+    queue='periodic',
+    routing_key='periodic.health'
 )
 def health_check_all_agents() -> Dict[str, Any]:
     """
@@ -183,6 +409,8 @@ def health_check_all_agents() -> Dict[str, Any]:
     base=DellBocaTask,
     name='core.tasks.generate_workflow',
     bind=True,
+    ignore_result=False,
+    acks_late=True,
     queue='workflow_tasks',
     routing_key='workflow.generate',
     time_limit=600
@@ -198,7 +426,7 @@ def generate_workflow(self, user_goal: str, context: Dict[str, Any]) -> Dict[str
     Returns:
         Generated workflow
     """
-    logger.info(f"Generating workflow for goal: {user_goal}")
+    logger.info("Generating workflow for goal: %s", user_goal)
 
     # Integration point for workflow generation
     return {
@@ -212,6 +440,8 @@ def generate_workflow(self, user_goal: str, context: Dict[str, Any]) -> Dict[str
     base=DellBocaTask,
     name='core.tasks.execute_workflow',
     bind=True,
+    ignore_result=False,
+    acks_late=True,
     queue='workflow_tasks',
     routing_key='workflow.execute'
 )
@@ -226,7 +456,7 @@ def execute_workflow(self, workflow_id: str, mode: str = "test") -> Dict[str, An
     Returns:
         Execution result
     """
-    logger.info(f"Executing workflow {workflow_id} in {mode} mode")
+    logger.info("Executing workflow %s in %s mode", workflow_id, mode)
 
     return {
         "success": True,
@@ -240,10 +470,47 @@ def execute_workflow(self, workflow_id: str, mode: str = "test") -> Dict[str, An
 # LLM Tasks
 # ============================================================================
 
+# Prompts per provider request, and sub-batches in flight at once
+LLM_BATCH_SIZE = 32
+LLM_MAX_CONCURRENT_BATCHES = 8
+
+
+def _infer_batch(
+    prompts: List[str],
+    start: int,
+    provider: str,
+    model: str
+) -> List[Dict[str, Any]]:
+    """
+    Run one sub-batch of prompts as a single provider request.
+
+    Args:
+        prompts: Prompts in this sub-batch
+        start: Index of the first prompt in the full batch
+        provider: LLM provider
+        model: Model name
+
+    Returns:
+        One response per prompt, in order
+    """
+    # Integration point for a batched LLM call (one round-trip per sub-batch)
+    return [
+        {
+            "prompt_index": start + offset,
+            "response": f"Response for prompt {start + offset}",
+            "provider": provider,
+            "model": model
+        }
+        for offset in range(len(prompts))
+    ]
+
+
 @celery_app.task(
     base=DellBocaTask,
     name='core.tasks.batch_llm_inference',
     bind=True,
+    ignore_result=False,
+    acks_late=True,
     queue='llm_tasks',
     routing_key='llm.batch',
     time_limit=1800
@@ -265,19 +532,19 @@ def batch_llm_inference(
     Returns:
         List of responses
     """
-    logger.info(f"Batch LLM inference: {len(prompts)} prompts via {provider}/{model}")
-
-    results = []
-    for i, prompt in enumerate(prompts):
-        # Integration point for LLM calls
-        results.append({
-            "prompt_index": i,
-            "response": f"Response for prompt {i}",
-            "provider": provider,
-            "model": model
-        })
+    logger.info("Batch LLM inference: %d prompts via %s/%s", len(prompts), provider, model)
+
+    starts = range(0, len(prompts), LLM_BATCH_SIZE)
+    if len(starts) <= 1:
+        return _infer_batch(prompts, 0, provider, model)
 
-    return results
+    # Sub-batches are IO-bound provider calls, so they run concurrently
+    with ThreadPoolExecutor(max_workers=min(LLM_MAX_CONCURRENT_BATCHES, len(starts))) as pool:
+        batches = pool.map(
+            lambda start: _infer_batch(prompts[start:start + LLM_BATCH_SIZE], start, provider, model),
+            starts
+        )
+        return [result for batch in batches for result in batch]
 
 
 # ============================================================================
@@ -287,6 +554,7 @@ def batch_llm_inference(
 @celery_app.task(
     base=DellBocaTask,
     name='core.tasks.consolidate_memory',
+    acks_late=True,
     queue='memory_tasks',
     routing_key='memory.consolidate'
 )
@@ -300,7 +568,7 @@ def consolidate_memory(memory_type: Optional[str] = None) -> Dict[str, Any]:
     Returns:
         Consolidation results
     """
-    logger.info(f"Consolidating memory: {memory_type or 'all'}")
+    logger.info("Consolidating memory: %s", memory_type or 'all')
 
     return {
         "success": True,
@@ -320,6 +588,9 @@ def cleanup_expired_memory() -> Dict[str, Any]:
     """
     Clean up expired memory entries.
 
+    Not scheduled: Redis-resident memory expires through its key TTL. Run
+    on demand for stores without native expiry.
+
     Returns:
         Cleanup results
     """
@@ -338,7 +609,8 @@ def cleanup_expired_memory() -> Dict[str, Any]:
 @celery_app.task(
     base=DellBocaTask,
     name='core.tasks.update_collective_intelligence',
-    queue='default'
+    queue='periodic',
+    routing_key='periodic.collective_intelligence'
 )
 def update_collective_intelligence() -> Dict[str, Any]:
     """
@@ -363,7 +635,8 @@ def update_collective_intelligence() -> Dict[str, Any]:
 @celery_app.task(
     base=DellBocaTask,
     name='core.tasks.generate_daily_metrics',
-    queue='default'
+    queue='periodic',
+    routing_key='periodic.metrics'
 )
 def generate_daily_metrics() -> Dict[str, Any]:
     """
@@ -407,49 +680,91 @@ def create_workflow_generation_pipeline(user_goal: str, context: Dict[str, Any])
     return pipeline.apply_async()
 
 
-def parallel_agent_tasks(task_list: List[Dict[str, Any]]) -> Any:
+def parallel_agent_tasks(
+    task_list: List[Dict[str, Any]],
+    chunk_size: Optional[int] = None
+) -> Any:
     """
     Execute multiple agent tasks in parallel using Celery groups.
 
+    The whole group is published through one producer connection, and
+    GroupResult.get() joins natively against the Redis backend. For very
+    large fan-outs, chunk_size packs that many tasks into each message
+    (Celery chunks), cutting broker writes by the same factor at the cost
+    of running each chunk's tasks sequentially on one worker.
+
     Args:
         task_list: List of task specifications
+        chunk_size: Tasks per broker message (one message per task if None)
 
     Returns:
-        Group result
+        Group result; with chunk_size, each member result is the list of
+        results for its chunk
     """
-    tasks = group(
-        execute_agent_task.s(task['agent_id'], task['task_data'])
-        for task in task_list
-    )
+    if chunk_size and len(task_list) > chunk_size:
+        tasks = execute_agent_task.chunks(
+            ((task['agent_id'], task['task_data']) for task in task_list),
+            chunk_size
+        ).group()
+    else:
+        tasks = group(
+            execute_agent_task.s(task['agent_id'], task['task_data'])
+            for task in task_list
+        )
 
-    return tasks.apply_async()
+    with celery_app.producer_or_acquire() as producer:
+        return tasks.apply_async(producer=producer, ignore_result=False)
 
 
 # ============================================================================
 # Celery CLI Helper
 # ============================================================================
 
-def start_worker(queues: Optional[List[str]] = None, concurrency: int = 4):
+def start_worker(
+    queues: Optional[List[str]] = None,
+    concurrency: int = 4,
+    prefetch_multiplier: Optional[int] = None
+):
     """
     Start Celery worker.
 
     Args:
         queues: List of queues to consume (all if None)
         concurrency: Number of worker processes
+        prefetch_multiplier: Tasks reserved per process; defaults to
+            SHORT_TASK_PREFETCH_MULTIPLIER for workers consuming only short
+            task queues and 1 otherwise
     """
-    queue_args = ','.join(queues) if queues else 'default,agent_tasks,workflow_tasks,llm_tasks,memory_tasks'
+    queue_args = ','.join(queues) if queues else 'default,agent_tasks,workflow_tasks,llm_tasks,memory_tasks,periodic'
 
-    os.system(
-        f"celery -A core.tasks worker "
-        f"--loglevel=info "
-        f"--concurrency={concurrency} "
-        f"--queues={queue_args}"
-    )
+    if prefetch_multiplier is None:
+        short_only = bool(queues) and SHORT_TASK_QUEUES.issuperset(queues)
+        prefetch_multiplier = SHORT_TASK_PREFETCH_MULTIPLIER if short_only else 1
+
+    # Runs in this process (no shell, app already imported); gossip, mingle
+    # and heartbeats are worker-to-worker chatter over the broker that this
+    # deployment does not use
+    celery_app.worker_main(argv=[
+        'worker',
+        '--loglevel=info',
+        f'--concurrency={concurrency}',
+        f'--prefetch-multiplier={prefetch_multiplier}',
+        '-O', 'fair',
+        f'--queues={queue_args}',
+        '--without-gossip',
+        '--without-mingle',
+        '--without-heartbeat',
+    ])
+
+
+def start_periodic_worker():
+    """Start a small dedicated worker for the beat-scheduled 'periodic' queue."""
+    start_worker(queues=['periodic'], concurrency=1, prefetch_multiplier=1)
 
 
 def start_beat():
     """Start Celery beat scheduler."""
-    os.system("celery -A core.tasks beat --loglevel=info")
+    celery_app.Beat(loglevel='info').run()
 
 
 if __name__ == '__main__':
@@ -3,16 +3,54 @@
 WebSocket Manager for Real-Time Communication
 Supports agent-to-agent messaging, workflow updates, and live notifications
 """
+import os
 import json
 import asyncio
 import logging
-from typing import Dict, Set, Any, Optional, List
+import time
+from typing import Dict, Set, Any, Optional, List, Iterable
 from datetime import datetime
 from fastapi import WebSocket, WebSocketDisconnect
 from enum import Enum
+import redis.asyncio as aioredis
+
+
+def _json_encode(message: Any) -> str:
+    """Serialize a message as compact JSON text (as WebSocket.send_json does)."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+# Conditional import: orjson is optional and only speeds up message encoding
+try:
+    from orjson import dumps as _orjson_dumps, OPT_NON_STR_KEYS  # type: ignore
+
+    def _encode(message: Any) -> str:
+        """Serialize a message as compact JSON text (as WebSocket.send_json does)."""
+        try:
+            return _orjson_dumps(message, option=OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # e.g. integers wider than 64 bits, which the stdlib encoder accepts
+            return _json_encode(message)
+except ImportError:
+    _encode = _json_encode
 
 logger = logging.getLogger(__name__)
 
+# Message timestamps have one-second resolution; the formatted string is
+# rebuilt only when the second changes
+_ts_second = -1
+_ts_text = ""
+
+
+def _timestamp() -> str:
+    """Current local time in ISO format, cached per second."""
+    global _ts_second, _ts_text
+    second = int(time.time())
+    if second != _ts_second:
+        _ts_text = datetime.fromtimestamp(second).isoformat()
+        _ts_second = second
+    return _ts_text
+
 
 class MessageType(Enum):
     """WebSocket message types."""
@@ -34,21 +72,36 @@ class WebSocketManager:
     - Agent-to-agent messaging
     - Live workflow status updates
     - Broadcast and targeted messaging
+
+    With a redis_url, topic messages are routed through Redis pub/sub
+    (channel "ws:<topic>"), so a publish on any replica reaches subscribers
+    connected to every replica. Each replica subscribes only to the topics
+    its own connections follow.
     """
 
-    def __init__(self):
+    CHANNEL_PREFIX = "ws:"
+
+    def __init__(self, redis_url: Optional[str] = None):
         # Active connections by connection ID
         self.active_connections: Dict[str, WebSocket] = {}
 
         # Subscriptions: topic -> set of connection IDs
         self.subscriptions: Dict[str, Set[str]] = {}
 
+        # Reverse index: connection ID -> topics it is subscribed to
+        self.connection_topics: Dict[str, Set[str]] = {}
+
         # Agent connections: agent_id -> connection_id
         self.agent_connections: Dict[str, str] = {}
 
         # Connection metadata
         self.connection_metadata: Dict[str, Dict[str, Any]] = {}
 
+        # Cross-replica fan-out (disabled without a Redis URL)
+        self._redis = aioredis.Redis.from_url(redis_url, decode_responses=True) if redis_url else None
+        self._pubsub = self._redis.pubsub() if self._redis is not None else None
+        self._listener: Optional[asyncio.Task] = None
+
     async def connect(
         self,
         websocket: WebSocket,
@@ -71,7 +124,7 @@ class WebSocketManager:
         if metadata and "agent_id" in metadata:
             self.agent_connections[metadata["agent_id"]] = connection_id
 
-        logger.info(f"WebSocket connected: {connection_id} (total: {len(self.active_connections)})")
+        logger.info("WebSocket connected: %s (total: %d)", connection_id, len(self.active_connections))
 
         # Send connection acknowledgment
         await self.send_personal_message(
@@ -79,7 +132,7 @@ class WebSocketManager:
             {
                 "type": "connection_ack",
                 "connection_id": connection_id,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
                 "message": "Connected to Dell-Boca-Boys orchestrator"
             }
         )
@@ -96,10 +149,12 @@ class WebSocketManager:
             del self.active_connections[connection_id]
 
         # Remove from subscriptions
-        for topic in list(self.subscriptions.keys()):
-            self.subscriptions[topic].discard(connection_id)
-            if not self.subscriptions[topic]:
-                del self.subscriptions[topic]
+        for topic in self.connection_topics.pop(connection_id, ()):
+            subscribers = self.subscriptions.get(topic)
+            if subscribers is not None:
+                subscribers.discard(connection_id)
+                if not subscribers:
+                    await self._drop_topic(topic)
 
         # Remove agent connection
         metadata = self.connection_metadata.get(connection_id, {})
@@ -112,7 +167,7 @@ class WebSocketManager:
         if connection_id in self.connection_metadata:
             del self.connection_metadata[connection_id]
 
-        logger.info(f"WebSocket disconnected: {connection_id} (remaining: {len(self.active_connections)})")
+        logger.info("WebSocket disconnected: %s (remaining: %d)", connection_id, len(self.active_connections))
 
     async def send_personal_message(self, connection_id: str, message: Dict[str, Any]):
         """
@@ -125,7 +180,7 @@ class WebSocketManager:
         if connection_id in self.active_connections:
             websocket = self.active_connections[connection_id]
             try:
-                await websocket.send_json(message)
+                await websocket.send_text(_encode(message))
             except WebSocketDisconnect:
                 await self.disconnect(connection_id)
             except Exception as e:
@@ -144,11 +199,11 @@ class WebSocketManager:
             connection_id = self.agent_connections[target_agent_id]
             await self.send_personal_message(connection_id, {
                 "type": MessageType.AGENT_MESSAGE.value,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
                 "data": message
             })
         else:
-            logger.warning(f"Agent {target_agent_id} not connected")
+            logger.warning("Agent %s not connected", target_agent_id)
 
     async def broadcast(self, message: Dict[str, Any], exclude: Optional[Set[str]] = None):
         """
@@ -159,23 +214,10 @@ class WebSocketManager:
             exclude: Optional set of connection IDs to exclude
         """
         exclude = exclude or set()
-        disconnected = []
-
-        for connection_id, websocket in self.active_connections.items():
-            if connection_id in exclude:
-                continue
-
-            try:
-                await websocket.send_json(message)
-            except WebSocketDisconnect:
-                disconnected.append(connection_id)
-            except Exception as e:
-                logger.error(f"Error broadcasting to {connection_id}: {e}")
-                disconnected.append(connection_id)
-
-        # Cleanup disconnected clients
-        for connection_id in disconnected:
-            await self.disconnect(connection_id)
+        await self._send_many(
+            (connection_id for connection_id in self.active_connections if connection_id not in exclude),
+            _encode(message)
+        )
 
     async def subscribe(self, connection_id: str, topic: str):
         """
@@ -187,14 +229,19 @@ class WebSocketManager:
         """
         if topic not in self.subscriptions:
             self.subscriptions[topic] = set()
+            if self._pubsub is not None:
+                await self._pubsub.subscribe(self.CHANNEL_PREFIX + topic)
+                if self._listener is None or self._listener.done():
+                    self._listener = asyncio.create_task(self._listen())
 
         self.subscriptions[topic].add(connection_id)
-        logger.debug(f"Connection {connection_id} subscribed to '{topic}'")
+        self.connection_topics.setdefault(connection_id, set()).add(topic)
+        logger.debug("Connection %s subscribed to '%s'", connection_id, topic)
 
         await self.send_personal_message(connection_id, {
             "type": "subscription_ack",
             "topic": topic,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _timestamp()
         })
 
     async def unsubscribe(self, connection_id: str, topic: str):
@@ -202,9 +249,15 @@ class WebSocketManager:
         if topic in self.subscriptions:
             self.subscriptions[topic].discard(connection_id)
             if not self.subscriptions[topic]:
-                del self.subscriptions[topic]
+                await self._drop_topic(topic)
 
-        logger.debug(f"Connection {connection_id} unsubscribed from '{topic}'")
+        topics = self.connection_topics.get(connection_id)
+        if topics is not None:
+            topics.discard(topic)
+            if not topics:
+                del self.connection_topics[connection_id]
+
+        logger.debug("Connection %s unsubscribed from '%s'", connection_id, topic)
 
     async def publish(self, topic: str, message: Dict[str, Any]):
         """
@@ -214,29 +267,110 @@ class WebSocketManager:
             topic: Topic to publish to
             message: Message to publish
         """
-        if topic not in self.subscriptions:
+        await self.publish_many((topic,), message)
+
+    async def publish_many(self, topics: Iterable[str], message: Dict[str, Any]):
+        """
+        Publish one message to the subscribers of several topics.
+
+        The message body is serialized once and spliced into each topic's
+        envelope; a connection subscribed to several of the topics receives
+        one message per topic, as with separate publish calls.
+
+        Args:
+            topics: Topics to publish to
+            message: Message to publish
+        """
+        if self._redis is None:
+            topics = [topic for topic in topics if topic in self.subscriptions]
+        else:
+            topics = list(topics)
+        if not topics:
             return
 
-        disconnected = []
-        subscribers = self.subscriptions[topic].copy()
+        # Same layout as _encode of the envelope dict
+        prefix = '{"type":"topic_message","topic":'
+        suffix = f',"timestamp":{_encode(_timestamp())},"data":{_encode(message)}}}'
 
-        for connection_id in subscribers:
-            if connection_id not in self.active_connections:
-                disconnected.append(connection_id)
+        if self._redis is not None:
+            # Every replica (this one included) delivers from its listener
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for topic in topics:
+                    pipe.publish(self.CHANNEL_PREFIX + topic, prefix + _encode(topic) + suffix)
+                await pipe.execute()
+            return
+
+        # Topics go out one after another so no socket has two sends in flight
+        for topic in topics:
+            if topic in self.subscriptions:
+                await self._send_many(self.subscriptions[topic], prefix + _encode(topic) + suffix)
+
+    async def _drop_topic(self, topic: str):
+        """Forget a topic that has no local subscribers left."""
+        del self.subscriptions[topic]
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(self.CHANNEL_PREFIX + topic)
+
+    async def _listen(self):
+        """Deliver Redis pub/sub messages to local subscribers until none remain."""
+        prefix_length = len(self.CHANNEL_PREFIX)
+        while self.subscriptions:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"WebSocket pub/sub listener error: {e}")
+                await asyncio.sleep(1.0)
                 continue
 
-            websocket = self.active_connections[connection_id]
+            if message is None or message.get("type") != "message":
+                continue
+
+            subscribers = self.subscriptions.get(message["channel"][prefix_length:])
+            if subscribers:
+                await self._send_many(subscribers, message["data"])
+
+    async def close(self):
+        """Stop the pub/sub listener and close the Redis connection."""
+        if self._listener is not None:
+            self._listener.cancel()
             try:
-                await websocket.send_json({
-                    "type": "topic_message",
-                    "topic": topic,
-                    "timestamp": datetime.now().isoformat(),
-                    "data": message
-                })
-            except WebSocketDisconnect:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._redis is not None:
+            await self._pubsub.aclose()
+            await self._redis.aclose()
+
+    async def _send_many(self, connection_ids: Iterable[str], payload: str):
+        """
+        Send one serialized payload to many connections concurrently.
+
+        Connections that are gone or fail to receive are disconnected.
+
+        Args:
+            connection_ids: Target connections
+            payload: JSON text to send
+        """
+        disconnected = []
+        targets = []
+        for connection_id in list(connection_ids):
+            websocket = self.active_connections.get(connection_id)
+            if websocket is None:
                 disconnected.append(connection_id)
-            except Exception as e:
-                logger.error(f"Error publishing to {connection_id}: {e}")
+            else:
+                targets.append((connection_id, websocket))
+
+        results = await asyncio.gather(
+            *(websocket.send_text(payload) for _, websocket in targets),
+            return_exceptions=True
+        )
+        for (connection_id, _), result in zip(targets, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, WebSocketDisconnect):
+                    logger.error(f"Error sending message to {connection_id}: {result}")
                 disconnected.append(connection_id)
 
         # Cleanup disconnected clients
@@ -252,15 +386,8 @@ class WebSocketManager:
             status: Workflow status
             data: Additional workflow data
         """
-        topic = f"workflow:{workflow_id}"
-        await self.publish(topic, {
-            "workflow_id": workflow_id,
-            "status": status,
-            **data
-        })
-
-        # Also broadcast to general workflow topic
-        await self.publish("workflows", {
+        # Published to the workflow's own topic and the general workflow topic
+        await self.publish_many((f"workflow:{workflow_id}", "workflows"), {
             "workflow_id": workflow_id,
             "status": status,
             **data
@@ -291,5 +418,6 @@ class WebSocketManager:
         }
 
 
-# Global WebSocket manager instance
-ws_manager = WebSocketManager()
+# Global WebSocket manager instance; set WEBSOCKET_REDIS_URL to share topics
+# across replicas
+ws_manager = WebSocketManager(os.getenv("WEBSOCKET_REDIS_URL"))
@@ -212,13 +212,13 @@ async def demo_rbac():
     # Display permissions
     print_info("Admin Permissions:")
     for perm in sorted(list(admin.permissions))[:5]:
-        print(f"  - {perm.value}")
+        print(f"  - {perm.scope}")
     print(f"  ... and {len(admin.permissions) - 5} more")
     print()
 
     print_info("Developer Permissions:")
     for perm in sorted(list(developer.permissions))[:5]:
-        print(f"  - {perm.value}")
+        print(f"  - {perm.scope}")
     print(f"  ... and {len(developer.permissions) - 5} more")
     print()
 
@@ -294,10 +294,10 @@ async def demo_metrics():
     """Demo Prometheus metrics."""
     print_header("6. Prometheus Metrics")
 
-    from core.metrics import init_metrics
+    from core.metrics import DEFAULT_METRIC_FAMILIES, init_metrics
 
-    # Initialize metrics
-    metrics = init_metrics()
+    # Initialize metrics; the memory family is opt-in
+    metrics = init_metrics(enabled_families=DEFAULT_METRIC_FAMILIES | {'memory'})
 
     print_info("Prometheus Metrics Collector initialized")
     print()
@@ -336,11 +336,11 @@ async def demo_metrics():
         "Agent Metrics (5 types)",
         "Workflow Metrics (5 types)",
         "LLM Metrics (4 types)",
-        "Memory Metrics (4 types)",
+        "Memory Metrics (4 types, opt-in)",
         "Cache Metrics (4 types)",
         "API Metrics (4 types)",
-        "Circuit Breaker Metrics (4 types)",
-        "Collective Intelligence Metrics (4 types)",
+        "Circuit Breaker Metrics (4 types, opt-in)",
+        "Collective Intelligence Metrics (4 types, opt-in)",
         "System Metrics (2 types)"
     ]
     for cat in categories:
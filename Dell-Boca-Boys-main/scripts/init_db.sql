@@ -16,6 +16,7 @@
 -- Enable pgvector extension
 CREATE EXTENSION IF NOT EXISTS vector;
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- =============================================================================
 -- Documents Table
@@ -113,11 +114,12 @@ CREATE TABLE IF NOT EXISTS workflows (
     created_by TEXT DEFAULT 'system'
 );
 
--- Index for status filtering
-CREATE INDEX IF NOT EXISTS idx_workflows_status ON workflows(status);
+-- Indexes for status / creator filtering in list order
+CREATE INDEX IF NOT EXISTS idx_workflows_status_created ON workflows(status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_workflows_created_by_created ON workflows(created_by, created_at DESC, id DESC);
 
--- Index for temporal queries
-CREATE INDEX IF NOT EXISTS idx_workflows_created ON workflows(created_at DESC);
+-- Index for temporal queries and keyset pagination (id breaks created_at ties)
+CREATE INDEX IF NOT EXISTS idx_workflows_created_id ON workflows(created_at DESC, id DESC);
 
 -- Index for n8n workflow ID lookup
 CREATE INDEX IF NOT EXISTS idx_workflows_n8n_id ON workflows(n8n_workflow_id) WHERE n8n_workflow_id IS NOT NULL;
@@ -125,6 +127,10 @@ CREATE INDEX IF NOT EXISTS idx_workflows_n8n_id ON workflows(n8n_workflow_id) WH
 -- Index for user goal search
 CREATE INDEX IF NOT EXISTS idx_workflows_goal_fts ON workflows USING GIN (to_tsvector('english', user_goal));
 
+-- Trigram indexes for substring search on name and goal
+CREATE INDEX IF NOT EXISTS idx_workflows_name_trgm ON workflows USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_workflows_goal_trgm ON workflows USING GIN (user_goal gin_trgm_ops);
+
 -- =============================================================================
 -- Executions Table
 -- =============================================================================
@@ -152,11 +158,15 @@ CREATE TABLE IF NOT EXISTS executions (
     test_payload JSONB
 );
 
--- Index for workflow lookup
-CREATE INDEX IF NOT EXISTS idx_executions_workflow ON executions(workflow_id);
+-- Index for per-workflow history (also serves workflow lookup)
+CREATE INDEX IF NOT EXISTS ix_exec_workflow_started ON executions(workflow_id, started_at);
+
+-- Index for status filtering in time order
+CREATE INDEX IF NOT EXISTS ix_exec_status_started ON executions(status, started_at);
 
--- Index for status filtering
-CREATE INDEX IF NOT EXISTS idx_executions_status ON executions(status);
+-- Small indexes over in-flight executions only
+CREATE INDEX IF NOT EXISTS ix_exec_running ON executions(workflow_id) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS ix_exec_live_started ON executions(started_at DESC) WHERE status IN ('running', 'waiting');
 
 -- Index for temporal queries
 CREATE INDEX IF NOT EXISTS idx_executions_started ON executions(started_at DESC);
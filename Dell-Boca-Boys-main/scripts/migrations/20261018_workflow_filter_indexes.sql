@@ -0,0 +1,23 @@
+-- Migration: composite and partial indexes for filtered listings
+-- Lets list_workflows / list_executions filters walk an index in ORDER BY order and stop at LIMIT.
+
+BEGIN;
+
+-- Workflows: status / creator filters, newest first (id breaks ties for keyset paging)
+CREATE INDEX IF NOT EXISTS idx_workflows_status_created ON workflows(status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_workflows_created_by_created ON workflows(created_by, created_at DESC, id DESC);
+
+-- Executions: per-workflow history and status filters in time order
+CREATE INDEX IF NOT EXISTS ix_exec_workflow_started ON executions(workflow_id, started_at);
+CREATE INDEX IF NOT EXISTS ix_exec_status_started ON executions(status, started_at);
+
+-- Executions: in-flight only
+CREATE INDEX IF NOT EXISTS ix_exec_running ON executions(workflow_id) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS ix_exec_live_started ON executions(started_at DESC) WHERE status IN ('running', 'waiting');
+
+-- Superseded by the composites above (same leading column)
+DROP INDEX IF EXISTS idx_workflows_status;
+DROP INDEX IF EXISTS idx_executions_workflow;
+DROP INDEX IF EXISTS idx_executions_status;
+
+COMMIT;
@@ -0,0 +1,11 @@
+-- Migration: keyset pagination index for workflow listings
+-- list_workflows pages with WHERE (created_at, id) < (...) ORDER BY created_at DESC, id DESC.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS idx_workflows_created_id ON workflows(created_at DESC, id DESC);
+
+-- Superseded: the composite index serves every created_at-ordered scan
+DROP INDEX IF EXISTS idx_workflows_created;
+
+COMMIT;
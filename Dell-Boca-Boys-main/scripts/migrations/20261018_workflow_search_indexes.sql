@@ -0,0 +1,11 @@
+-- Migration: trigram indexes for workflow search
+-- Lets search_workflows' ILIKE '%term%' filters use an index instead of a sequential scan.
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_workflows_name_trgm ON workflows USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_workflows_goal_trgm ON workflows USING GIN (user_goal gin_trgm_ops);
+
+COMMIT;
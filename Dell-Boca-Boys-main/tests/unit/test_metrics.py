@@ -0,0 +1,223 @@
+"""
+Unit tests for the sharded hot-path metrics.
+Checks exposition parity with prometheus_client and exact counts under
+concurrent writers, scrapers and the per-thread update batcher.
+"""
+import asyncio
+import threading
+
+import pytest
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import disable_created_metrics, enable_created_metrics
+
+from core.metrics import FastCounter, FastHistogram, MetricsCollector, _MetricBatcher
+
+UPDATES = [
+    (("get", "200"), 1),
+    (("get", "200"), 2.5),
+    (("post", "500"), 1),
+    (("get", "404"), 0),
+    (("post", "500"), 7),
+]
+
+OBSERVATIONS = [0.001, 0.004, 0.03, 0.25, 0.25, 1.7, 9.0, 42.0]
+
+
+def exposition(registry):
+    """Exposition lines in a stable order (series order is not significant)."""
+    return sorted(generate_latest(registry).decode().splitlines())
+
+
+@pytest.fixture
+def no_created_series():
+    # FastCounter/FastHistogram do not expose *_created samples
+    disable_created_metrics()
+    yield
+    enable_created_metrics()
+
+
+@pytest.mark.unit
+class TestExpositionParity:
+    """Fast metrics must expose exactly what prometheus_client would."""
+
+    def test_counter_matches_prometheus_client(self, no_created_series):
+        fast_registry, reference_registry = CollectorRegistry(), CollectorRegistry()
+        fast = FastCounter("requests", "Requests", ["method", "status"], registry=fast_registry)
+        reference = Counter("requests", "Requests", ["method", "status"], registry=reference_registry)
+
+        for labelvalues, amount in UPDATES:
+            fast.labels(*labelvalues).inc(amount)
+            reference.labels(*labelvalues).inc(amount)
+
+        assert exposition(fast_registry) == exposition(reference_registry)
+
+    def test_counter_keyword_labels(self, no_created_series):
+        fast_registry, reference_registry = CollectorRegistry(), CollectorRegistry()
+        fast = FastCounter("requests", "Requests", ["method", "status"], registry=fast_registry)
+        reference = Counter("requests", "Requests", ["method", "status"], registry=reference_registry)
+
+        fast.labels(status="200", method="get").inc()
+        reference.labels(status="200", method="get").inc()
+
+        assert exposition(fast_registry) == exposition(reference_registry)
+
+    def test_labelled_histogram_matches_prometheus_client(self, no_created_series):
+        buckets = (0.005, 0.05, 0.5, 5.0)
+        fast_registry, reference_registry = CollectorRegistry(), CollectorRegistry()
+        fast = FastHistogram("latency_seconds", "Latency", ["route"], registry=fast_registry, buckets=buckets)
+        reference = Histogram("latency_seconds", "Latency", ["route"], registry=reference_registry, buckets=buckets)
+
+        for index, value in enumerate(OBSERVATIONS):
+            route = "/a" if index % 3 else "/b"
+            fast.labels(route).observe(value)
+            reference.labels(route).observe(value)
+
+        assert exposition(fast_registry) == exposition(reference_registry)
+
+    def test_unlabelled_histogram_matches_prometheus_client(self, no_created_series):
+        fast_registry, reference_registry = CollectorRegistry(), CollectorRegistry()
+        fast = FastHistogram("size_bytes", "Size", [], registry=fast_registry)
+        reference = Histogram("size_bytes", "Size", registry=reference_registry)
+
+        for value in OBSERVATIONS:
+            fast.observe(value)
+            reference.observe(value)
+
+        assert exposition(fast_registry) == exposition(reference_registry)
+
+    def test_exposition_is_cumulative_across_scrapes(self, no_created_series):
+        fast_registry, reference_registry = CollectorRegistry(), CollectorRegistry()
+        fast = FastCounter("events", "Events", ["kind"], registry=fast_registry)
+        reference = Counter("events", "Events", ["kind"], registry=reference_registry)
+
+        for _ in range(3):
+            fast.labels("a").inc()
+            reference.labels("a").inc()
+            assert exposition(fast_registry) == exposition(reference_registry)
+
+    def test_rejects_negative_counter_increment(self):
+        counter = FastCounter("events", "Events", ["kind"])
+        with pytest.raises(ValueError):
+            counter.labels("a").inc(-1)
+
+
+@pytest.mark.unit
+class TestConcurrentUpdates:
+    """No update may be lost to concurrent writers or scrapes."""
+
+    THREADS = 8
+    PER_THREAD = 5000
+
+    def _run_threads(self, target):
+        threads = [threading.Thread(target=target, args=(i,)) for i in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def test_counter_under_concurrent_writers_and_scrapes(self):
+        counter = FastCounter("events", "Events", ["kind"], shards=4)
+        done = threading.Event()
+
+        def write(index):
+            shared, own = counter.labels("shared"), counter.labels(f"t{index}")
+            for _ in range(self.PER_THREAD):
+                shared.inc()
+                own.inc(2)
+
+        def scrape():
+            while not done.is_set():
+                counter.values()
+
+        scraper = threading.Thread(target=scrape)
+        scraper.start()
+        for thread in self._run_threads(write):
+            thread.join()
+        done.set()
+        scraper.join()
+
+        values = counter.values()
+        assert values[("shared",)] == self.THREADS * self.PER_THREAD
+        for index in range(self.THREADS):
+            assert values[(f"t{index}",)] == 2 * self.PER_THREAD
+
+    def test_histogram_under_concurrent_writers(self):
+        histogram = FastHistogram("latency", "Latency", ["route"], buckets=(1.0,), shards=2)
+
+        def write(index):
+            child = histogram.labels("/a")
+            for i in range(self.PER_THREAD):
+                child.observe(0.5 if i % 2 else 2.0)
+
+        for thread in self._run_threads(write):
+            thread.join()
+
+        below, above, total = histogram.values()[("/a",)]
+        assert below == above == self.THREADS * self.PER_THREAD // 2
+        assert total == pytest.approx(self.THREADS * self.PER_THREAD * 1.25)
+
+    def test_batcher_applies_every_update_from_threads(self):
+        batcher = _MetricBatcher(max_pending=7)
+        counter = FastCounter("events", "Events", ["kind"])
+
+        def write(index):
+            child = counter.labels("shared")
+            for _ in range(self.PER_THREAD):
+                batcher.add(child)
+
+        for thread in self._run_threads(write):
+            thread.join()
+        batcher.flush_all()
+
+        assert counter.values()[("shared",)] == self.THREADS * self.PER_THREAD
+
+    def test_batcher_flushes_on_a_running_loop(self):
+        batcher = _MetricBatcher(max_pending=100, flush_delay=0.001)
+        counter = FastCounter("events", "Events", ["kind"])
+
+        async def run():
+            child = counter.labels("a")
+            for _ in range(10):
+                batcher.add(child)
+            # Buffered until the delayed flush fires
+            pending = counter.values().get(("a",), 0)
+            await asyncio.sleep(0.01)
+            return pending
+
+        assert asyncio.run(run()) == 0
+        assert counter.values()[("a",)] == 10
+
+    def test_flush_all_before_scrape_sees_buffered_updates(self):
+        batcher = _MetricBatcher(max_pending=100, flush_delay=60)
+        counter = FastCounter("events", "Events", ["kind"])
+
+        async def run():
+            child = counter.labels("a")
+            for _ in range(5):
+                batcher.add(child)
+            batcher.flush_all()
+            return counter.values()[("a",)]
+
+        assert asyncio.run(run()) == 5
+
+
+@pytest.mark.unit
+class TestUptimeUpdates:
+    """The uptime thread starts on demand, never on construction."""
+
+    def test_not_started_until_first_export(self):
+        collector = MetricsCollector(registry=CollectorRegistry())
+        try:
+            assert collector._uptime_thread is None
+            collector.export_metrics()
+            thread = collector._uptime_thread
+            assert thread.is_alive()
+            collector.start_uptime_updates()
+            assert collector._uptime_thread is thread
+        finally:
+            collector.close()
+
+    def test_closed_collector_does_not_start(self):
+        collector = MetricsCollector(registry=CollectorRegistry())
+        collector.close()
+        collector.export_metrics()
+        assert collector._uptime_thread is None
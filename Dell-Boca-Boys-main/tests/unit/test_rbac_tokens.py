@@ -0,0 +1,123 @@
+"""
+Unit tests for RBACManager token verification.
+Covers the HS256 fast path, strict validation, caching and revocation.
+"""
+import asyncio
+import time
+
+import pytest
+
+from core.exceptions import AuthenticationError
+from core.rbac import RBACManager, Permission, Role, User
+
+
+@pytest.mark.unit
+class TestTokenVerification:
+    """Test suite for RBACManager.verify_token / verify_token_async."""
+
+    @pytest.fixture
+    def manager(self):
+        return RBACManager(secret_key="unit-test-secret-key-of-at-least-32-bytes")
+
+    @pytest.fixture
+    def user(self):
+        return User(
+            user_id="u1",
+            username="terry",
+            email="terry@example.com",
+            hashed_password="x",
+            roles={Role.VIEWER},
+            permissions=Permission.WORKFLOW_READ
+        )
+
+    def _malformed_token(self, manager):
+        """A token signed with our key whose claims have the wrong types."""
+        now = int(time.time())
+        return manager._encode_token({
+            "sub": "u1", "username": "terry", "roles": "viewer",
+            "permissions": "everything", "exp": now + 60, "iat": now, "jti": "j1"
+        })
+
+    def test_fast_and_strict_agree_on_valid_token(self, manager, user):
+        token = manager.create_access_token(user)
+
+        fast = manager.verify_token(token)
+        manager._verify_cache.clear()
+        strict = manager.verify_token(token, strict=True)
+
+        assert fast.sub == strict.sub == "u1"
+        assert Permission(fast.permissions) == Permission(strict.permissions) == Permission.WORKFLOW_READ
+
+    @pytest.mark.skipif(not hasattr(time, "tzset"), reason="needs time.tzset")
+    @pytest.mark.parametrize("tz", ["America/New_York", "Asia/Tokyo"])
+    def test_fresh_token_valid_outside_utc(self, manager, user, monkeypatch, tz):
+        monkeypatch.setenv("TZ", tz)
+        time.tzset()
+        try:
+            token = manager.create_access_token(user)
+            for strict in (False, True):
+                manager._verify_cache.clear()
+                assert manager.verify_token(token, strict=strict).sub == "u1"
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+
+    def test_strict_revalidates_fast_cached_payload(self, manager):
+        token = self._malformed_token(manager)
+
+        # The fast path trusts our own signature and caches the payload as-is
+        assert manager.verify_token(token).permissions == "everything"
+
+        with pytest.raises(AuthenticationError):
+            manager.verify_token(token, strict=True)
+        with pytest.raises(AuthenticationError):
+            asyncio.run(manager.verify_token_async(token, strict=True))
+
+    def test_strict_result_serves_fast_callers(self, manager, user):
+        token = manager.create_access_token(user)
+        manager.verify_token(token, strict=True)
+        assert manager._verify_cache[next(iter(manager._verify_cache))][2] is True
+        assert manager.verify_token(token).username == "terry"
+
+    def test_tampered_token_rejected(self, manager, user):
+        token = manager.create_access_token(user)
+        header, payload, signature = token.split(".")
+        tampered = ".".join((header, payload, signature[:-2] + ("AA" if signature[-2:] != "AA" else "BB")))
+
+        for strict in (False, True):
+            with pytest.raises(AuthenticationError):
+                manager.verify_token(tampered, strict=strict)
+
+    def test_expired_token_rejected(self, manager, user):
+        from datetime import timedelta
+        token = manager.create_access_token(user, expires_delta=timedelta(seconds=-1))
+
+        for strict in (False, True):
+            with pytest.raises(AuthenticationError):
+                manager.verify_token(token, strict=strict)
+
+    def test_revocation_applies_to_cached_tokens(self, manager, user):
+        token = manager.create_access_token(user)
+        manager.verify_token(token)
+        manager.revoke_token(token)
+
+        with pytest.raises(AuthenticationError):
+            manager.verify_token(token)
+
+    def test_async_shares_one_verification(self, manager, user):
+        token = manager.create_access_token(user)
+        calls = []
+        original = manager.verify_token
+
+        def counting(*args):
+            calls.append(args)
+            return original(*args)
+
+        manager.verify_token = counting
+
+        async def run():
+            return await asyncio.gather(*(manager.verify_token_async(token) for _ in range(10)))
+
+        results = asyncio.run(run())
+        assert {result.jti for result in results} == {results[0].jti}
+        assert len(calls) == 1
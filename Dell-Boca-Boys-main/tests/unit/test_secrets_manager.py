@@ -0,0 +1,86 @@
+"""
+Unit tests for the local encrypted secrets log.
+Covers replay, torn-write recovery, and refusal to load with the wrong key.
+"""
+import json
+
+import pytest
+from cryptography.fernet import Fernet
+
+from core.exceptions import ConfigurationException
+from core.secrets_manager import LocalSecretsManager
+
+
+@pytest.mark.unit
+class TestLocalSecretsManager:
+    """Test suite for LocalSecretsManager."""
+
+    @pytest.fixture
+    def key(self):
+        return Fernet.generate_key()
+
+    @pytest.fixture
+    def secrets_file(self, tmp_path, monkeypatch):
+        # The manager reads/writes .key in the working directory
+        monkeypatch.chdir(tmp_path)
+        return str(tmp_path / "secrets.enc")
+
+    @pytest.fixture
+    def populated(self, secrets_file, key):
+        manager = LocalSecretsManager(secrets_file, encryption_key=key)
+        manager.set_secret("db", {"password": "a"})
+        manager.set_secret("api", {"token": "b"})
+        manager.set_secret("smtp", {"password": "c"})
+        manager.delete_secret("api")
+        return manager
+
+    def test_replays_log(self, populated, secrets_file, key):
+        reloaded = LocalSecretsManager(secrets_file, encryption_key=key)
+        assert reloaded.secrets == {"db": {"password": "a"}, "smtp": {"password": "c"}}
+
+    def test_wrong_key_raises_and_leaves_file_intact(self, populated, secrets_file, key):
+        with open(secrets_file, "rb") as f:
+            before = f.read()
+
+        with pytest.raises(ConfigurationException):
+            LocalSecretsManager(secrets_file, encryption_key=Fernet.generate_key())
+
+        with open(secrets_file, "rb") as f:
+            assert f.read() == before
+        reloaded = LocalSecretsManager(secrets_file, encryption_key=key)
+        assert set(reloaded.secrets) == {"db", "smtp"}
+
+    def test_torn_final_write_is_dropped(self, populated, secrets_file, key):
+        with open(secrets_file, "ab") as f:
+            f.write(Fernet(key).encrypt(b'["set", "x", {}]')[:20])
+
+        reloaded = LocalSecretsManager(secrets_file, encryption_key=key)
+        assert set(reloaded.secrets) == {"db", "smtp"}
+
+        # The torn line was compacted away, so later appends replay cleanly
+        reloaded.set_secret("x", {"v": 1})
+        again = LocalSecretsManager(secrets_file, encryption_key=key)
+        assert set(again.secrets) == {"db", "smtp", "x"}
+
+    def test_corrupt_middle_record_raises(self, populated, secrets_file, key):
+        with open(secrets_file, "rb") as f:
+            lines = f.read().splitlines(keepends=True)
+        lines[1] = b"garbage\n"
+        with open(secrets_file, "wb") as f:
+            f.writelines(lines)
+
+        with pytest.raises(ConfigurationException):
+            LocalSecretsManager(secrets_file, encryption_key=key)
+
+    def test_legacy_file_is_converted_with_backup(self, secrets_file, key):
+        legacy = Fernet(key).encrypt(json.dumps({"db": {"password": "a"}}).encode())
+        with open(secrets_file, "wb") as f:
+            f.write(legacy)
+
+        manager = LocalSecretsManager(secrets_file, encryption_key=key)
+        assert manager.secrets == {"db": {"password": "a"}}
+
+        with open(f"{secrets_file}.bak", "rb") as f:
+            assert f.read() == legacy
+        with open(secrets_file, "rb") as f:
+            assert f.read().endswith(b"\n")
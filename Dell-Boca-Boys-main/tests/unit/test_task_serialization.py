@@ -0,0 +1,100 @@
+"""
+Unit tests for the Celery message serializers in core.tasks.
+Bodies must decode to what kombu's json would have produced, and the
+compression framing must stay readable by every worker.
+"""
+import datetime
+import decimal
+import os
+import uuid
+import zlib
+
+import pytest
+from kombu.utils.json import dumps as kombu_dumps, loads as kombu_loads
+
+from core import tasks
+
+PAYLOAD = {
+    "int_keys": {1: "a", 2: "b"},
+    "amount": decimal.Decimal("10.25"),
+    "started": datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc),
+    "day": datetime.date(2024, 5, 1),
+    "raw": b"bytes",
+    "nested": [{"at": datetime.datetime(2024, 5, 1, 12, 30)}],
+}
+
+
+def jsonz_round_trip(obj):
+    return tasks._json_loads(tasks._decompress(tasks._compress(tasks._json_dumps(obj))))
+
+
+@pytest.mark.unit
+class TestJsonzSerializer:
+    """Test suite for the jsonz serializer."""
+
+    def test_matches_kombu_json(self):
+        assert jsonz_round_trip(PAYLOAD) == kombu_loads(kombu_dumps(PAYLOAD))
+
+    def test_large_bodies_match_kombu_json(self):
+        payload = {"rows": [PAYLOAD] * 200}
+        assert len(tasks._json_dumps(payload)) >= tasks.COMPRESS_MIN_BYTES
+        assert jsonz_round_trip(payload) == kombu_loads(kombu_dumps(payload))
+
+    def test_typed_values_are_revived(self):
+        result = jsonz_round_trip(PAYLOAD)
+        assert result["amount"] == decimal.Decimal("10.25")
+        assert result["started"] == PAYLOAD["started"]
+        assert result["nested"][0]["at"] == PAYLOAD["nested"][0]["at"]
+        assert result["int_keys"] == {"1": "a", "2": "b"}
+
+
+@pytest.mark.unit
+class TestCompressionFraming:
+    """Test suite for _compress/_decompress."""
+
+    def test_small_bodies_are_sent_raw(self):
+        assert tasks._compress(b"{}") == b"\x00{}"
+
+    def test_large_bodies_use_zlib_by_default(self, monkeypatch):
+        monkeypatch.setattr(tasks, "MESSAGE_COMPRESSION", "zlib")
+        body = b"x" * tasks.COMPRESS_MIN_BYTES
+        framed = tasks._compress(body)
+        assert framed[:1] == b"\x01"
+        assert zlib.decompress(framed[1:]) == body
+        assert tasks._decompress(framed) == body
+
+    def test_unknown_codec_rejected(self):
+        with pytest.raises(ValueError):
+            tasks._decompress(b"\x7fbody")
+
+
+@pytest.mark.unit
+class TestMsgpackzSerializer:
+    """Test suite for the opt-in msgpackz serializer."""
+
+    @pytest.fixture(autouse=True)
+    def requires_msgpack(self):
+        pytest.importorskip("msgpack")
+
+    @pytest.mark.skipif("CELERY_MESSAGE_SERIALIZER" in os.environ, reason="serializer configured")
+    def test_json_is_the_default(self):
+        assert tasks.MESSAGE_SERIALIZER == "jsonz"
+        assert tasks.celery_app.conf.task_serializer == "jsonz"
+        assert "msgpackz" in tasks.ACCEPTED_SERIALIZERS
+
+    def test_round_trips_typed_values(self):
+        payload = dict(
+            PAYLOAD,
+            workflow_id=uuid.uuid4(),
+            at=datetime.time(8, 15),
+            rows=[PAYLOAD] * 200,
+        )
+        body = tasks._compress(tasks._msgpack_dumps(payload))
+        assert tasks._msgpack_loads(tasks._decompress(body)) == payload
+
+    def test_int_keys_survive(self):
+        assert tasks._msgpack_loads(tasks._msgpack_dumps({1: {2: "x"}})) == {1: {2: "x"}}
+
+    def test_unsupported_type_raises(self):
+        with pytest.raises(TypeError):
+            tasks._msgpack_dumps({"x": object()})
@@ -0,0 +1,33 @@
+"""
+Unit tests for the WebSocket message encoder.
+_encode must produce the same text as WebSocket.send_json for any payload
+the stdlib encoder accepts.
+"""
+import json
+
+import pytest
+
+from core.websocket.manager import _encode
+
+
+def send_json_text(message):
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+@pytest.mark.unit
+class TestEncode:
+    """Test suite for _encode."""
+
+    @pytest.mark.parametrize("message", [
+        {"type": "update", "data": {"progress": 0.5, "nodes": [1, 2, 3]}},
+        {1: "a", 2: {3: "b"}},
+        {"big": 2 ** 70, "negative": -(2 ** 65)},
+        {"text": "café ✓"},
+        [None, True, False, 1.25],
+    ])
+    def test_matches_send_json(self, message):
+        assert _encode(message) == send_json_text(message)
+
+    def test_unserializable_raises_type_error(self):
+        with pytest.raises(TypeError):
+            _encode({"x": object()})
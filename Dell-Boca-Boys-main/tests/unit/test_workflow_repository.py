@@ -0,0 +1,298 @@
+"""
+Unit tests for WorkflowRepository's in-process caching and batching.
+Covers the get_workflow TTL cache, the get_workflow_batched loader and the
+create_execution_batched insert coalescer, against a fake session.
+"""
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import core.workflow_repository as workflow_repository
+from core.exceptions import DatabaseException, WorkflowNotFoundError
+from core.workflow_repository import Workflow, WorkflowRepository
+
+
+class FakeResult:
+    """Just enough of an SQLAlchemy Result for the repository's reads."""
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return iter(self._rows)
+
+    def scalar_one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+
+class FakeDatabase:
+    """
+    Stands in for the engine: serves workflows by ID, counts statements,
+    and can be told to fail queries or commits.
+    """
+
+    def __init__(self, workflows=()):
+        self.workflows = {workflow.id: workflow for workflow in workflows}
+        self.statements = []
+        self.fail_execute = None
+        self.fail_commit = None
+
+    async def execute(self, statement, params=None):
+        self.statements.append((statement, params))
+        await asyncio.sleep(0)
+        if self.fail_execute is not None:
+            raise self.fail_execute
+
+        ids = self._requested_ids(statement)
+        return FakeResult([self.workflows[i] for i in ids if i in self.workflows])
+
+    @staticmethod
+    def _requested_ids(statement):
+        criterion = getattr(statement, "whereclause", None)
+        if criterion is None:
+            return []
+        value = criterion.right.value
+        return value if isinstance(value, (list, tuple)) else [value]
+
+    @asynccontextmanager
+    async def session(self):
+        yield self
+        if self.fail_commit is not None:
+            raise self.fail_commit
+
+
+def make_workflow(name="wf"):
+    return Workflow(id=uuid.uuid4(), name=name, user_goal="goal", workflow_json={})
+
+
+@pytest.fixture
+def make_repo():
+    """Build a repository whose sessions are served by a FakeDatabase."""
+    def factory(database):
+        with patch.object(workflow_repository, "create_async_engine", MagicMock()):
+            repo = WorkflowRepository("postgresql+asyncpg://test/test")
+        repo.session = database.session
+        repo.read_session = database.session
+        return repo
+    return factory
+
+
+@pytest.mark.unit
+class TestWorkflowCache:
+    """Test suite for the get_workflow TTL cache."""
+
+    def test_repeated_reads_hit_cache(self, make_repo):
+        workflow = make_workflow()
+        database = FakeDatabase([workflow])
+        repo = make_repo(database)
+
+        async def run():
+            first = await repo.get_workflow(workflow.id)
+            second = await repo.get_workflow(workflow.id)
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first is second is workflow
+        assert len(database.statements) == 1
+
+    def test_concurrent_misses_share_one_query(self, make_repo):
+        workflow = make_workflow()
+        database = FakeDatabase([workflow])
+        repo = make_repo(database)
+
+        async def run():
+            return await asyncio.gather(*(repo.get_workflow(workflow.id) for _ in range(10)))
+
+        assert all(result is workflow for result in asyncio.run(run()))
+        assert len(database.statements) == 1
+
+    def test_expired_entries_are_refetched(self, make_repo, monkeypatch):
+        monkeypatch.setattr(workflow_repository, "WORKFLOW_CACHE_TTL", 0.0)
+        workflow = make_workflow()
+        database = FakeDatabase([workflow])
+        repo = make_repo(database)
+
+        async def run():
+            await repo.get_workflow(workflow.id)
+            await repo.get_workflow(workflow.id)
+
+        asyncio.run(run())
+        assert len(database.statements) == 2
+
+    def test_cache_is_bounded(self, make_repo, monkeypatch):
+        monkeypatch.setattr(workflow_repository, "WORKFLOW_CACHE_MAX_SIZE", 3)
+        workflows = [make_workflow(f"wf{i}") for i in range(5)]
+        repo = make_repo(FakeDatabase(workflows))
+
+        async def run():
+            for workflow in workflows:
+                await repo.get_workflow(workflow.id)
+
+        asyncio.run(run())
+        assert list(repo._workflow_cache) == [workflow.id for workflow in workflows[2:]]
+
+    def test_failed_update_commit_is_not_cached(self, make_repo):
+        workflow = make_workflow()
+        database = FakeDatabase([workflow])
+        repo = make_repo(database)
+        repo._cache_workflow(workflow)
+        database.fail_commit = RuntimeError("commit failed")
+
+        with pytest.raises(DatabaseException):
+            asyncio.run(repo.update_workflow(workflow.id, name="renamed"))
+        assert workflow.id not in repo._workflow_cache
+
+    def test_read_racing_delete_is_not_cached(self, make_repo):
+        workflow = make_workflow()
+        repo = make_repo(FakeDatabase([workflow]))
+        repo._cache_workflow(workflow)
+
+        asyncio.run(repo.delete_workflow(workflow.id))
+        # A get_workflow that read the row before the DELETE committed
+        repo._cache_workflow(workflow)
+
+        assert workflow.id not in repo._workflow_cache
+
+    def test_delete_tombstones_expire(self, make_repo, monkeypatch):
+        monkeypatch.setattr(workflow_repository, "WORKFLOW_CACHE_TTL", 0.0)
+        workflow, other = make_workflow(), make_workflow("other")
+        repo = make_repo(FakeDatabase([workflow]))
+
+        asyncio.run(repo.delete_workflow(workflow.id))
+        repo._cache_workflow(other)
+
+        assert repo._deleted_workflows == {}
+
+
+@pytest.mark.unit
+class TestWorkflowBatchLoader:
+    """Test suite for get_workflow_batched."""
+
+    def test_concurrent_lookups_share_one_query(self, make_repo):
+        workflows = [make_workflow(f"wf{i}") for i in range(5)]
+        database = FakeDatabase(workflows)
+        repo = make_repo(database)
+        ids = [workflow.id for workflow in workflows] + [workflows[0].id]
+
+        async def run():
+            return await asyncio.gather(*(repo.get_workflow_batched(i) for i in ids))
+
+        results = asyncio.run(run())
+        assert [result.id for result in results] == ids
+        assert len(database.statements) == 1
+        assert set(repo._workflow_cache) == set(ids)
+        assert repo._pending_workflows == {}
+
+    def test_missing_ids_fail_only_their_callers(self, make_repo):
+        workflow = make_workflow()
+        repo = make_repo(FakeDatabase([workflow]))
+
+        async def run():
+            return await asyncio.gather(
+                repo.get_workflow_batched(workflow.id),
+                repo.get_workflow_batched(uuid.uuid4()),
+                return_exceptions=True
+            )
+
+        found, missing = asyncio.run(run())
+        assert found is workflow
+        assert isinstance(missing, WorkflowNotFoundError)
+
+    def test_query_errors_reach_every_caller(self, make_repo):
+        database = FakeDatabase()
+        database.fail_execute = RuntimeError("connection lost")
+        repo = make_repo(database)
+
+        async def run():
+            return await asyncio.gather(
+                *(repo.get_workflow_batched(uuid.uuid4()) for _ in range(3)),
+                return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert repo._pending_workflows == {}
+
+    def test_cancelled_caller_does_not_fail_others(self, make_repo):
+        workflow = make_workflow()
+        repo = make_repo(FakeDatabase([workflow]))
+
+        async def run():
+            doomed = asyncio.ensure_future(repo.get_workflow_batched(workflow.id))
+            survivor = asyncio.ensure_future(repo.get_workflow_batched(workflow.id))
+            await asyncio.sleep(0)
+            doomed.cancel()
+            return await survivor
+
+        assert asyncio.run(run()) is workflow
+
+
+@pytest.mark.unit
+class TestExecutionInsertBatcher:
+    """Test suite for create_execution_batched and create_executions."""
+
+    def test_concurrent_creates_share_one_insert(self, make_repo):
+        repo = make_repo(FakeDatabase())
+        repo.create_executions = AsyncMock(side_effect=lambda rows: [uuid.uuid4() for _ in rows])
+        workflow_id = uuid.uuid4()
+
+        async def run():
+            return await asyncio.gather(
+                *(repo.create_execution_batched(workflow_id, "test") for _ in range(20))
+            )
+
+        ids = asyncio.run(run())
+        assert len(set(ids)) == 20
+        repo.create_executions.assert_awaited_once()
+        rows = repo.create_executions.await_args.args[0]
+        assert len(rows) == 20
+        assert rows[0] == {"workflow_id": workflow_id, "mode": "test", "status": "running"}
+
+    def test_batches_are_capped(self, make_repo, monkeypatch):
+        monkeypatch.setattr(workflow_repository, "EXECUTION_BATCH_MAX_SIZE", 8)
+        repo = make_repo(FakeDatabase())
+        repo.create_executions = AsyncMock(side_effect=lambda rows: [uuid.uuid4() for _ in rows])
+
+        async def run():
+            return await asyncio.gather(
+                *(repo.create_execution_batched(uuid.uuid4(), "test") for _ in range(20))
+            )
+
+        assert len(set(asyncio.run(run()))) == 20
+        assert [len(call.args[0]) for call in repo.create_executions.await_args_list] == [8, 8, 4]
+
+    def test_insert_errors_reach_every_caller(self, make_repo):
+        repo = make_repo(FakeDatabase())
+        error = DatabaseException("execution_create", "boom")
+        repo.create_executions = AsyncMock(side_effect=error)
+
+        async def run():
+            results = await asyncio.gather(
+                *(repo.create_execution_batched(uuid.uuid4(), "test") for _ in range(5)),
+                return_exceptions=True
+            )
+            # The batcher recovers for later calls
+            repo.create_executions = AsyncMock(side_effect=lambda rows: [uuid.uuid4() for _ in rows])
+            return results, await repo.create_execution_batched(uuid.uuid4(), "test")
+
+        results, later = asyncio.run(run())
+        assert all(result is error for result in results)
+        assert isinstance(later, uuid.UUID)
+        assert repo._execution_flush_task is None
+
+    def test_rows_with_different_fields_use_separate_statements(self, make_repo):
+        database = FakeDatabase()
+        repo = make_repo(database)
+        workflow_id = uuid.uuid4()
+
+        ids = asyncio.run(repo.create_executions([
+            {"workflow_id": workflow_id, "mode": "test"},
+            {"workflow_id": workflow_id, "mode": "test"},
+            {"workflow_id": workflow_id, "mode": "test", "error_message": "x"},
+        ]))
+
+        assert len(set(ids)) == 3
+        assert sorted(len(params) for _, params in database.statements) == [1, 2]